@@ -1,20 +1,142 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import text
-from database import engineconn
-from models import UserCreate, UserResponse, Token, UserWalletCreate, UserWalletResponse
-from auth import get_db, create_user, authenticate_user, get_current_active_user, get_user_by_id
-from security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from contextlib import asynccontextmanager, suppress
+from config import settings
+from database import init_engine, get_engine, dispose_engine, replica_router, replica_status
+from hashing import hash_executor
+from catalog import stock_catalog
+from leaderboard import leaderboard
+from prices import price_ingestor
+from pubsub import hub, price_topic, sse_events, wallet_topic
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import asyncio
+import logging
+from pydantic import ValidationError
+from models import (
+    UserCreate, UserResponse, Token, RefreshTokenRequest, UserWalletCreate, UserWalletResponse,
+    WalletAdjustment, WalletAdjustmentResult, WalletAdjustmentBatchResponse, StockResponse,
+    OrderCreate, OrderResponse, PortfolioResponse, LeaderboardEntry, LeaderboardResponse,
+    PriceTick, PriceIngestResponse, WalletHistoryResponse,
+)
+from typing import List, Optional
+from auth import get_db, get_read_db, create_user, authenticate_user, get_current_active_user, get_user_by_id, principal_cache, require_admin
+from wallet import credit_wallet, set_wallet_balance, get_wallet_balance, get_wallet_history, apply_wallet_adjustments, WALLET_BATCH_SIZE
+from trading import buy_stock, sell_stock
+from portfolio import get_portfolio
+from idempotency import idempotency_store, request_fingerprint
+from ratelimit import RateLimitMiddleware, rate_limiter
+from metrics import MetricsMiddleware, render_metrics
+from profiler import SQLProfileMiddleware, sql_profiler
+from refresh_tokens import issue_refresh_token, rotate_refresh_token, revoke_refresh_token, revoke_user_refresh_tokens
+from security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, token_cache, jwt_keyring
 from datetime import timedelta
+from decimal import Decimal
+
+logger = logging.getLogger(__name__)
+
+def _on_balance_changed(user_id: int, money):
+    """커밋된 잔액 변경을 순위와 실시간 스트림 구독자에게 전파 (이후 조회는 잠시 기본 DB에서 처리)"""
+    replica_router.mark_write(user_id)
+    leaderboard.set_balance(user_id, money)
+    hub.publish(wallet_topic(user_id), {"type": "wallet", "user_id": user_id, "money": float(money)})
+
+def _token_response(sub: str, refresh_token: str) -> Token:
+    """액세스 토큰을 생성해 리프레시 토큰과 함께 응답"""
+    access_token = create_access_token(
+        data={"sub": sub}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+def _mark_replayed(response: Response, replayed: bool):
+    """Idempotency-Key 재응답임을 헤더로 표시"""
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+
+def _publish_prices(prices):
+    """반영된 시세를 종목별 스트림 구독자에게 전파"""
+    for j_id, price in prices.items():
+        hub.publish(price_topic(j_id), {"type": "price", "j_id": j_id, "price": float(price)})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명 동안 하나의 엔진/커넥션 풀을 공유"""
+    init_engine()
+    stock_catalog.reset()
+    leaderboard.reset()
+    idempotency_store.reset()
+    rate_limiter.reset()
+    sql_profiler.reset()
+    replica_router.reset()
+    rebuild_task = asyncio.create_task(leaderboard.run_periodic_rebuild())
+    # 반영된 시세를 인메모리 캐시들에 전파
+    price_ingestor.subscribe(stock_catalog.apply_prices)
+    price_ingestor.subscribe(leaderboard.set_prices)
+    price_ingestor.subscribe(_publish_prices)
+    price_task = asyncio.create_task(price_ingestor.run())
+    purge_task = asyncio.create_task(idempotency_store.run_periodic_purge()) if idempotency_store.use_db else None
+    key_reload_task = asyncio.create_task(jwt_keyring.run_periodic_reload()) if jwt_keyring.keys_dir else None
+    yield
+    if key_reload_task is not None:
+        key_reload_task.cancel()
+    price_task.cancel()
+    if purge_task is not None:
+        purge_task.cancel()
+    rebuild_task.cancel()
+    # 진행 중이던 주기 반영이 취소(미반영 틱은 복원)될 때까지 기다린 뒤 남은 틱을 한 번만 반영
+    with suppress(asyncio.CancelledError):
+        await price_task
+    try:
+        await price_ingestor.flush()
+    except Exception:
+        # DB 장애로 남은 시세를 반영하지 못해도 종료는 계속 진행
+        logger.exception("종료 시 남은 시세 반영 실패 (틱 %d개 유실)", price_ingestor.pending)
+    await dispose_engine()
+    hash_executor.shutdown()
 
 app = FastAPI(
     title="KHackarthon Backend API",
     description="JWT 인증이 포함된 백엔드 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+# 로그인/회원가입 요청 제한 - 라우팅 전에 실행되어 거절된 요청은 DB 조회나 해싱을 하지 않음
+app.add_middleware(RateLimitMiddleware)
+# SQL_PROFILE_MODE가 header이면 X-SQL-Profile: 1 요청만 요청 단위 SQL 프로파일링
+app.add_middleware(SQLProfileMiddleware)
+# 가장 바깥에서 실행되어 요청 제한으로 거절된 요청도 집계
+app.add_middleware(MetricsMiddleware)
+
+async def _iter_json_items(request: Request):
+    """요청 본문의 JSON 배열 또는 NDJSON 스트림에서 (순번, 원본 항목)을 차례로 생성
+
+    NDJSON(application/x-ndjson)은 본문 전체를 메모리에 올리지 않고 줄 단위로 읽음
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
 
-# 데이터베이스 엔진 설정
-engine = engineconn()
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="요청 본문은 JSON 배열 또는 NDJSON이어야 합니다."
+        )
+    for index, item in enumerate(body):
+        yield index, item
 
 @app.get("/")
 async def root():
@@ -25,18 +147,46 @@ async def health_check():
     """헬스 체크 API - 데이터베이스 연결 상태 확인"""
     try:
         # 데이터베이스 연결 테스트 - SQLAlchemy 2.0 호환
-        with engine.engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
+        async with get_engine().connection() as conn:
+            result = await conn.execute(text("SELECT 1"))
             result.fetchone()
         return {"status": "healthy", "message": "데이터베이스 연결 정상"}
     except Exception as e:
         return {"status": "unhealthy", "message": f"데이터베이스 연결 실패: {str(e)}"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 형식 지표 - 라우트별 요청 수/처리 시간, 요청당 SQL 횟수/시간, 커넥션 풀 대기, 해싱/JWT 시간"""
+    return PlainTextResponse(
+        render_metrics(get_engine().pool_status()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+@app.get("/stats", dependencies=[Depends(require_admin)])
+async def stats():
+    """운영 지표 API (관리자) - 커넥션 풀 점유 현황, 복제본 주소와 라우팅 현황 등"""
+    return {
+        "db_pool": get_engine().pool_status(),
+        "db_replicas": replica_status(),
+        "hashing": hash_executor.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "stock_catalog": stock_catalog.stats(),
+        "leaderboard": leaderboard.stats(),
+        "price_ingest": price_ingestor.stats(),
+        "pubsub": hub.stats(),
+        "idempotency": idempotency_store.stats(),
+        "jwt_keys": jwt_keyring.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "sql_profiler": sql_profiler.stats(),
+    }
+
 @app.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate, db=Depends(get_db)):
     """회원가입 API"""
     try:
-        db_user = create_user(db, user)
+        db_user = await create_user(db, user)
+        leaderboard.add_user(db_user.user_id, db_user.id)
         return UserResponse(
             user_id=db_user.user_id,
             id=db_user.id
@@ -55,7 +205,7 @@ async def login_for_access_token(
     db=Depends(get_db)
 ):
     """로그인 API - JWT 토큰 발급"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,13 +213,70 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 액세스 토큰 생성
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    
-    return Token(access_token=access_token, token_type="bearer")
+    # 리프레시 토큰 발급 후 액세스 토큰 생성
+    refresh_token = await issue_refresh_token(db, user.user_id)
+    await db.commit()
+    return _token_response(user.id, refresh_token)
+
+@app.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    """JWT 검증용 공개 키 목록 (RS256 사용 시) - 다른 서비스는 kid로 키를 골라 직접 검증"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return jwt_keyring.jwks()
+
+@app.get("/admin/config", dependencies=[Depends(require_admin)])
+async def read_config():
+    """시작 시 검증된 현재 설정 (읽기 전용) - 비밀 키는 가리고 DB URL의 패스워드는 숨김"""
+    return settings.redacted()
+
+@app.get("/admin/sql-profiles", dependencies=[Depends(require_admin)])
+async def read_sql_profiles(limit: int = Query(20, ge=1, le=100)):
+    """최근 SQL 프로파일 결과 (최신순) - 요청별 문장 수, N+1 의심 문장, 가장 느린 문장과 매개변수 모양"""
+    return {"mode": sql_profiler.mode, "profiles": sql_profiler.recent(limit)}
+
+@app.post("/admin/jwt-keys/rotate", dependencies=[Depends(require_admin)])
+async def rotate_jwt_key():
+    """JWT 서명 키 회전 - 새 키로 서명을 시작하고 이전 키는 기존 토큰 검증용으로 유지"""
+    try:
+        kid = await asyncio.to_thread(jwt_keyring.rotate)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"active_kid": kid, "keys": len(jwt_keyring.jwks()["keys"])}
+
+@app.delete("/admin/jwt-keys/{kid}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
+async def retire_jwt_key(kid: str):
+    """이전 JWT 서명 키 제거 - 이 키로 발급된 토큰이 모두 만료된 뒤 호출"""
+    try:
+        removed = jwt_keyring.retire(kid)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JWT 키를 찾을 수 없습니다.")
+    # 제거된 키로 검증되어 캐시된 토큰도 더 이상 통과하지 않도록 비움
+    token_cache.clear()
+
+@app.post("/token/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshTokenRequest, db=Depends(get_db)):
+    """토큰 갱신 API - 리프레시 토큰을 회전하고 새 액세스 토큰 발급 (패스워드 검증 없음)"""
+    try:
+        sub, refresh_token = await rotate_refresh_token(db, body.refresh_token)
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
+    return _token_response(sub, refresh_token)
+
+@app.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(body: RefreshTokenRequest, db=Depends(get_db)):
+    """로그아웃 API - 리프레시 토큰과 같은 로그인에서 회전된 토큰을 모두 폐기 (알 수 없는 토큰도 204)"""
+    await revoke_refresh_token(db, body.refresh_token)
+    await db.commit()
+
+@app.post("/users/me/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(current_user=Depends(get_current_active_user), db=Depends(get_db)):
+    """모든 기기 로그아웃 - 사용자의 리프레시 토큰 전체 폐기"""
+    await revoke_user_refresh_tokens(db, current_user.user_id)
+    await db.commit()
 
 @app.get("/users/me", response_model=UserResponse)
 async def read_users_me(current_user=Depends(get_current_active_user)):
@@ -91,42 +298,35 @@ async def protected_route(current_user=Depends(get_current_active_user)):
 @app.post("/users/me/wallet", response_model=UserWalletResponse, status_code=status.HTTP_201_CREATED)
 async def create_user_wallet(
     wallet_data: UserWalletCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user=Depends(get_current_active_user),
     db=Depends(get_db)
 ):
-    """사용자 지갑 생성 또는 업데이트"""
+    """사용자 지갑 생성 또는 업데이트 - 단일 upsert 문으로 처리 (Idempotency-Key 재시도는 원래 응답 재사용)"""
+    async def operation():
+        money = await set_wallet_balance(db, current_user.user_id, Decimal(str(wallet_data.money)))
+        return UserWalletResponse(
+            user_id=current_user.user_id,
+            money=float(money)
+        )
+
     try:
-        from models import UserWallet
-        from decimal import Decimal
-        
-        # 기존 지갑이 있는지 확인
-        existing_wallet = db.query(UserWallet).filter(UserWallet.user_id == current_user.user_id).first()
-        
-        if existing_wallet:
-            # 기존 지갑 업데이트
-            existing_wallet.money = Decimal(str(wallet_data.money))
-            db.commit()
-            db.refresh(existing_wallet)
-            return UserWalletResponse(
-                user_id=existing_wallet.user_id,
-                money=float(existing_wallet.money)
-            )
-        else:
-            # 새 지갑 생성
-            new_wallet = UserWallet(
-                user_id=current_user.user_id,
-                money=Decimal(str(wallet_data.money))
-            )
-            db.add(new_wallet)
-            db.commit()
-            db.refresh(new_wallet)
-            return UserWalletResponse(
-                user_id=new_wallet.user_id,
-                money=float(new_wallet.money)
-            )
+        result, replayed = await idempotency_store.execute(
+            db, current_user.user_id, idempotency_key,
+            request_fingerprint("POST /users/me/wallet", wallet_data.money),
+            UserWalletResponse, operation,
+        )
+        _mark_replayed(response, replayed)
+        if not replayed:
+            _on_balance_changed(current_user.user_id, Decimal(str(result.money)))
+        return result
             
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"지갑 생성/업데이트 중 오류가 발생했습니다: {str(e)}"
@@ -135,24 +335,14 @@ async def create_user_wallet(
 @app.get("/users/me/wallet", response_model=UserWalletResponse)
 async def get_user_wallet(
     current_user=Depends(get_current_active_user),
-    db=Depends(get_db)
+    db=Depends(get_read_db)
 ):
-    """사용자 지갑 조회"""
+    """사용자 지갑 조회 - 지갑이 없으면 쓰기 없이 잔액 0 반환"""
     try:
-        from models import UserWallet
-        
-        wallet = db.query(UserWallet).filter(UserWallet.user_id == current_user.user_id).first()
-        
-        if not wallet:
-            # 지갑이 없으면 기본값 0으로 생성
-            wallet = UserWallet(user_id=current_user.user_id, money=0)
-            db.add(wallet)
-            db.commit()
-            db.refresh(wallet)
-        
+        money = await get_wallet_balance(db, current_user.user_id)
         return UserWalletResponse(
-            user_id=wallet.user_id,
-            money=float(wallet.money)
+            user_id=current_user.user_id,
+            money=float(money)
         )
         
     except Exception as e:
@@ -164,43 +354,254 @@ async def get_user_wallet(
 @app.put("/users/me/wallet/add", response_model=UserWalletResponse)
 async def add_money_to_wallet(
     amount: float,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user=Depends(get_current_active_user),
     db=Depends(get_db)
 ):
-    """사용자 지갑에 돈 추가"""
+    """사용자 지갑에 돈 추가 - 잔액 증가는 단일 SQL 문으로 원자적으로 처리 (Idempotency-Key 재시도는 한 번만 반영)"""
+    async def operation():
+        money = await credit_wallet(db, current_user.user_id, Decimal(str(amount)))
+        return UserWalletResponse(
+            user_id=current_user.user_id,
+            money=float(money)
+        )
+
     try:
-        from models import UserWallet
-        from decimal import Decimal
-        
         if amount <= 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="추가할 금액은 0보다 커야 합니다."
             )
         
-        wallet = db.query(UserWallet).filter(UserWallet.user_id == current_user.user_id).first()
-        
-        if not wallet:
-            # 지갑이 없으면 새로 생성
-            wallet = UserWallet(user_id=current_user.user_id, money=Decimal(str(amount)))
-            db.add(wallet)
-        else:
-            # 기존 지갑에 금액 추가 (Decimal로 변환)
-            wallet.money += Decimal(str(amount))
-        
-        db.commit()
-        db.refresh(wallet)
-        
-        return UserWalletResponse(
-            user_id=wallet.user_id,
-            money=float(wallet.money)
+        result, replayed = await idempotency_store.execute(
+            db, current_user.user_id, idempotency_key,
+            request_fingerprint("PUT /users/me/wallet/add", amount),
+            UserWalletResponse, operation,
         )
+        _mark_replayed(response, replayed)
+        if not replayed:
+            _on_balance_changed(current_user.user_id, Decimal(str(result.money)))
+        return result
         
     except HTTPException:
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"돈 추가 중 오류가 발생했습니다: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@app.get("/users/me/wallet/history", response_model=WalletHistoryResponse)
+async def read_wallet_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, ge=1),
+    current_user=Depends(get_current_active_user),
+    db=Depends(get_read_db)
+):
+    """지갑 거래 내역 조회 (최신순) - 다음 페이지는 응답의 next_cursor를 cursor로 전달"""
+    try:
+        return await get_wallet_history(db, current_user.user_id, limit, cursor)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"지갑 거래 내역 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@app.post("/wallets/adjustments", response_model=WalletAdjustmentBatchResponse, dependencies=[Depends(require_admin)])
+async def apply_wallet_adjustment_batch(request: Request, db=Depends(get_db)):
+    """지갑 일괄 조정 API (정산 작업용) - 여러 사용자의 충전/차감을 묶음 단위 트랜잭션으로 적용"""
+    results = []
+    batch = []
+
+    async def flush():
+        try:
+            batch_results = await apply_wallet_adjustments(db, batch)
+            await db.commit()
+            results.extend(batch_results)
+            for result in batch_results:
+                if result.status == "applied":
+                    _on_balance_changed(result.user_id, Decimal(str(result.money)))
+        except Exception as e:
+            await db.rollback()
+            results.extend(
+                WalletAdjustmentResult(index=index, user_id=adjustment.user_id, status="failed", detail=str(e))
+                for index, adjustment in batch
+            )
+        batch.clear()
+
+    async for index, item in _iter_json_items(request):
+        try:
+            if isinstance(item, bytes):
+                adjustment = WalletAdjustment.model_validate_json(item)
+            else:
+                adjustment = WalletAdjustment.model_validate(item)
+        except ValidationError as e:
+            results.append(WalletAdjustmentResult(index=index, status="invalid", detail=str(e.errors()[0]["msg"])))
+            continue
+        batch.append((index, adjustment))
+        if len(batch) >= WALLET_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    results.sort(key=lambda result: result.index)
+    applied = sum(1 for result in results if result.status == "applied")
+    return WalletAdjustmentBatchResponse(applied=applied, rejected=len(results) - applied, results=results)
+
+# 주식 목록 관련 API들 (프로세스 로컬 스냅샷에서 응답)
+@app.get("/stocks", response_model=List[StockResponse], response_model_exclude_none=True)
+async def list_stocks(include_explanation: bool = False):
+    """주식 목록 조회 - 설명(explanation)은 요청 시에만 포함"""
+    return await stock_catalog.list_stocks(include_explanation)
+
+@app.post(
+    "/stocks/prices",
+    response_model=PriceIngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin)],
+)
+async def ingest_stock_prices(request: Request):
+    """시세 일괄 수신 API (JSON 배열 또는 NDJSON) - 종목별로 병합하여 주기마다 일괄 반영"""
+    accepted = 0
+    rejected = 0
+    async for _, item in _iter_json_items(request):
+        try:
+            if isinstance(item, bytes):
+                tick = PriceTick.model_validate_json(item)
+            else:
+                tick = PriceTick.model_validate(item)
+        except ValidationError:
+            rejected += 1
+            continue
+        if await stock_catalog.get_stock(tick.j_id) is None:
+            rejected += 1
+            continue
+        price_ingestor.submit(tick.j_id, Decimal(str(tick.price)))
+        accepted += 1
+    return PriceIngestResponse(accepted=accepted, rejected=rejected, pending=price_ingestor.pending)
+
+@app.get("/stocks/{j_id}", response_model=StockResponse)
+async def get_stock(j_id: int):
+    """주식 상세 조회"""
+    stock = await stock_catalog.get_stock(j_id)
+    if stock is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 주식입니다."
+        )
+    return stock
+
+# 주식 주문 관련 API들
+@app.post("/users/me/orders/buy", response_model=OrderResponse)
+async def buy_order(
+    order: OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user=Depends(get_current_active_user),
+    db=Depends(get_db)
+):
+    """주식 매수 - 지갑 차감과 보유 수량 증가를 하나의 트랜잭션으로 처리"""
+    try:
+        result, replayed = await idempotency_store.execute(
+            db, current_user.user_id, idempotency_key,
+            request_fingerprint("POST /users/me/orders/buy", order.j_id, order.quantity),
+            OrderResponse, lambda: buy_stock(db, current_user.user_id, order.j_id, order.quantity),
+        )
+        _mark_replayed(response, replayed)
+        if not replayed:
+            _on_balance_changed(current_user.user_id, Decimal(str(result.money)))
+            leaderboard.set_holding(current_user.user_id, order.j_id, result.holding_quantity, Decimal(str(result.price)))
+        return result
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"매수 주문 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@app.post("/users/me/orders/sell", response_model=OrderResponse)
+async def sell_order(
+    order: OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user=Depends(get_current_active_user),
+    db=Depends(get_db)
+):
+    """주식 매도 - 지갑 입금과 보유 수량 감소를 하나의 트랜잭션으로 처리"""
+    try:
+        result, replayed = await idempotency_store.execute(
+            db, current_user.user_id, idempotency_key,
+            request_fingerprint("POST /users/me/orders/sell", order.j_id, order.quantity),
+            OrderResponse, lambda: sell_stock(db, current_user.user_id, order.j_id, order.quantity),
+        )
+        _mark_replayed(response, replayed)
+        if not replayed:
+            _on_balance_changed(current_user.user_id, Decimal(str(result.money)))
+            leaderboard.set_holding(current_user.user_id, order.j_id, result.holding_quantity, Decimal(str(result.price)))
+        return result
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"매도 주문 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@app.get("/users/me/portfolio", response_model=PortfolioResponse)
+async def read_portfolio(
+    current_user=Depends(get_current_active_user),
+    db=Depends(get_read_db)
+):
+    """보유 주식 평가 조회 - 매입 원가, 현재 평가 금액, 평가 손익"""
+    try:
+        return await get_portfolio(db, current_user.user_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"포트폴리오 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+# 순자산 순위 관련 API들 (인메모리 순위 구조에서 응답)
+@app.get("/leaderboard", response_model=LeaderboardResponse)
+async def read_leaderboard(limit: int = Query(10, ge=1, le=100)):
+    """순자산(지갑 잔액 + 보유 주식 평가액) 상위 사용자 조회"""
+    await leaderboard.ensure_built()
+    return LeaderboardResponse(total_users=len(leaderboard), entries=leaderboard.top(limit))
+
+@app.get("/leaderboard/me", response_model=LeaderboardEntry)
+async def read_my_rank(current_user=Depends(get_current_active_user)):
+    """현재 사용자의 순자산 순위 조회"""
+    await leaderboard.ensure_built()
+    entry = leaderboard.rank_of(current_user.user_id)
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="순위 정보가 아직 집계되지 않았습니다."
+        )
+    return entry
+
+# 실시간 변경 스트림 (Server-Sent Events)
+@app.get("/stream")
+async def stream_updates(stocks: str = "", current_user=Depends(get_current_active_user)):
+    """지갑 잔액 및 구독한 주식(stocks=1,2,3)의 시세 변경을 실시간으로 전송"""
+    try:
+        j_ids = {int(j_id) for j_id in stocks.split(",") if j_id.strip()}
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="stocks는 쉼표로 구분된 주식 ID 목록이어야 합니다."
+        )
+    topics = [wallet_topic(current_user.user_id)] + [price_topic(j_id) for j_id in sorted(j_ids)]
+    return StreamingResponse(
+        sse_events(hub, topics),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,12 +2,16 @@ from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
-from database import engineconn
+from database import get_engine
 from models import UserCreate, UserResponse, Token
 from auth import get_db, create_user, authenticate_user, get_current_active_user
 from security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta
 import json
+import logging
+
+# 요청 로그는 로깅 핸들러로 보내 표준 출력 쓰기가 요청 처리 경로를 막지 않도록 함
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="KHackarthon Backend API (Debug Version)",
@@ -15,9 +19,6 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# 데이터베이스 엔진 설정
-engine = engineconn()
-
 @app.get("/")
 async def root():
     return {"message": "KHackarthon Backend API (Debug Version)"}
@@ -27,8 +28,8 @@ async def health_check():
     """헬스 체크 API - 데이터베이스 연결 상태 확인"""
     try:
         # 데이터베이스 연결 테스트 - SQLAlchemy 2.0 호환
-        with engine.engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
+        async with get_engine().connection() as conn:
+            result = await conn.execute(text("SELECT 1"))
             result.fetchone()
         return {"status": "healthy", "message": "데이터베이스 연결 정상"}
     except Exception as e:
@@ -38,18 +39,18 @@ async def health_check():
 async def register(request: Request):
     """회원가입 API - 디버그 버전"""
     try:
-        print("=== 회원가입 API 호출됨 ===")
+        logger.debug("회원가입 API 호출됨")
         
         # 요청 본문 읽기
         body = await request.body()
-        print(f"요청 본문 (raw): {body}")
+        logger.debug("요청 본문 크기: %d bytes", len(body))
         
-        # JSON 파싱
+        # JSON 파싱 (패스워드가 포함되므로 본문 내용은 기록하지 않음)
         try:
             body_json = await request.json()
-            print(f"요청 본문 (JSON): {body_json}")
+            logger.debug("요청 필드: %s", list(body_json) if isinstance(body_json, dict) else type(body_json).__name__)
         except Exception as json_error:
-            print(f"JSON 파싱 오류: {json_error}")
+            logger.info("JSON 파싱 오류: %s", json_error)
             return JSONResponse(
                 content={"error": "잘못된 JSON 형식"},
                 status_code=status.HTTP_400_BAD_REQUEST
@@ -69,16 +70,14 @@ async def register(request: Request):
             "message": "회원가입 성공 (디버그 모드)"
         }
         
-        print(f"응답 데이터: {response_data}")
+        logger.debug("응답 데이터: %s", response_data)
         return JSONResponse(
             content=response_data,
             status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
-        print(f"회원가입 API 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("회원가입 API 오류")
         return JSONResponse(
             content={"error": f"서버 오류: {str(e)}"},
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -89,7 +88,7 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """로그인 API - 디버그 버전"""
-    print(f"로그인 시도: {form_data.username}")
+    logger.debug("로그인 시도: %s", form_data.username)
     
     # 간단한 응답 (인증 없이)
     return {
@@ -1,32 +1,47 @@
-from fastapi import Depends, HTTPException, status
+import time
+import secrets
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from database import engineconn
-from models import User, UserCreate, UserResponse
-from security import verify_password, get_password_hash, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache import TTLCache
+from config import settings
+from database import get_engine, get_read_engine
+from models import User, UserCreate, UserResponse, CurrentUser
+from security import verify_and_update_password_async, get_password_hash_async, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta
 
 # OAuth2 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_db():
+# 인증된 사용자 캐시 (토큰 subject -> CurrentUser), TTL은 토큰 만료 시각을 넘지 않음
+PRINCIPAL_CACHE_SIZE = settings.principal_cache_size
+PRINCIPAL_CACHE_TTL = settings.principal_cache_ttl
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+# 운영 작업(정산 등) 전용 API 키 - 설정되지 않으면 관리자 API 비활성화
+ADMIN_API_KEY = settings.admin_api_key.get_secret_value() if settings.admin_api_key else None
+
+def invalidate_principal(user_id: str):
+    """사용자 생성/삭제 시 캐시된 인증 정보 무효화"""
+    principal_cache.invalidate(user_id)
+
+async def get_db():
     """데이터베이스 세션 생성"""
-    engine = engineconn()
-    SessionLocal = engine.sessionmaker()
-    db = SessionLocal()
-    try:
+    SessionLocal = get_engine().sessionmaker()
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_user_by_id(db: Session, user_id: str):
+async def get_user_by_id(db: AsyncSession, user_id: str):
     """사용자 ID로 사용자 조회"""
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
 
-def create_user(db: Session, user: UserCreate):
+async def create_user(db: AsyncSession, user: UserCreate):
     """새 사용자 생성 (회원가입)"""
     # 이미 존재하는 사용자인지 확인
-    db_user = get_user_by_id(db, user.id)
+    db_user = await get_user_by_id(db, user.id)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -34,7 +49,7 @@ def create_user(db: Session, user: UserCreate):
         )
     
     # 패스워드 해싱
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     
     # 새 사용자 생성
     db_user = User(
@@ -43,23 +58,37 @@ def create_user(db: Session, user: UserCreate):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_principal(db_user.id)
     
     return db_user
 
-def authenticate_user(db: Session, user_id: str, password: str):
-    """사용자 인증"""
-    user = get_user_by_id(db, user_id)
+async def delete_user(db: AsyncSession, user_id: str) -> bool:
+    """사용자 삭제 (회원탈퇴)"""
+    # 지갑/보유 주식은 외래키 ON DELETE CASCADE로 함께 삭제
+    result = await db.execute(delete(User).where(User.id == user_id))
+    await db.commit()
+    invalidate_principal(user_id)
+    return result.rowcount > 0
+
+async def authenticate_user(db: AsyncSession, user_id: str, password: str):
+    """사용자 인증 - 패스워드 해시가 현재 설정과 다르면 재해싱"""
+    user = await get_user_by_id(db, user_id)
     if not user:
         return False
-    if not verify_password(password, user.password):
+    verified, new_hash = await verify_and_update_password_async(password, user.password)
+    if not verified:
         return False
+    if new_hash is not None:
+        # 예전 방식/비용으로 저장된 해시는 로그인 성공 시 현재 설정으로 교체
+        user.password = new_hash
+        await db.commit()
     return user
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """현재 인증된 사용자 조회"""
-    from security import verify_token
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """현재 인증된 사용자 조회 - 캐시 적중 시 DB 조회 없음"""
+    from security import decode_access_token
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,16 +96,47 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    user_id = verify_token(token)
-    if user_id is None:
+    token_data = decode_access_token(token)
+    if token_data is None:
         raise credentials_exception
     
-    user = get_user_by_id(db, user_id)
+    current_user = principal_cache.get(token_data.id)
+    if current_user is not None:
+        return current_user
+    
+    engine = get_read_engine()
+    async with engine.sessionmaker()() as db:
+        user = await get_user_by_id(db, token_data.id)
+    if user is None and engine is not get_engine():
+        # 방금 가입해 아직 복제본에 반영되지 않은 사용자일 수 있으므로 기본 DB에서 다시 확인
+        async with get_engine().sessionmaker()() as db:
+            user = await get_user_by_id(db, token_data.id)
     if user is None:
         raise credentials_exception
     
-    return user
+    current_user = CurrentUser.model_validate(user)
+    ttl = token_data.exp - time.time() if token_data.exp is not None else None
+    principal_cache.set(token_data.id, current_user, ttl=ttl)
+    return current_user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     """현재 활성 사용자 조회"""
     return current_user
+
+async def get_read_db(current_user: CurrentUser = Depends(get_current_active_user)):
+    """조회 전용 데이터베이스 세션 - 복제본으로 라우팅하되 최근 쓰기가 있었던 사용자는 기본 DB 사용"""
+    SessionLocal = get_read_engine(current_user.user_id).sessionmaker()
+    async with SessionLocal() as db:
+        yield db
+
+def is_admin_key(x_admin_key: Optional[str]) -> bool:
+    """관리자 API 키 일치 여부 (키가 설정되지 않았으면 항상 False)"""
+    return bool(ADMIN_API_KEY and x_admin_key and secrets.compare_digest(x_admin_key, ADMIN_API_KEY))
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """관리자 API 키 검증 (X-Admin-Key 헤더)"""
+    if not is_admin_key(x_admin_key):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다."
+        )
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+매수/매도 주문 부하 테스트 - 소수 사용자에 주문을 집중시켜 잠금 경합 상황의 처리량과 p99 측정
+사용법: python -m benchmarks.bench_orders [--orders 2000] [--concurrency 32] [--users 4] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.common import add_stock, app_client, configure_database, register_user, run_concurrent
+
+async def main_async(args):
+    async with app_client() as client:
+        j_id = await add_stock("벤치마크전자", 100)
+        users = [await register_user(client, f"orderbench{i}") for i in range(args.users)]
+        for headers in users:
+            await client.post("/users/me/wallet", json={"money": 10_000_000}, headers=headers)
+
+        async def order(i: int) -> bool:
+            # 같은 사용자에게 매수/매도를 번갈아 보내 지갑/보유 주식 행 경합 유발
+            side = "buy" if (i // args.users) % 2 == 0 else "sell"
+            response = await client.post(
+                f"/users/me/orders/{side}",
+                json={"j_id": j_id, "quantity": 1},
+                headers=users[i % args.users],
+            )
+            return response.status_code == 200 or (side == "sell" and response.status_code == 400)
+
+        result = await run_concurrent(order, args.orders, args.concurrency)
+
+    print("📈 주문 부하 테스트 결과")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="매수/매도 주문 부하 테스트")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=4, help="주문을 나눠 받을 사용자 수 (적을수록 경합 증가)")
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.db_url)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
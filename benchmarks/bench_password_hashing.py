@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+패스워드 해싱 설정별 벤치마크 - 해싱 처리량(회/초)과 로그인 p99 측정
+설정 형식: bcrypt:<rounds> 또는 argon2:<time_cost>:<memory_cost KiB>:<parallelism> (argon2는 argon2-cffi 필요)
+사용법: python -m benchmarks.bench_password_hashing [--configs bcrypt:10,bcrypt:12,argon2:3:65536:4] [--hashes 64] [--logins 200] [--concurrency 16] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import app_client, configure_database, run_concurrent
+
+def parse_config(spec: str) -> dict:
+    """설정 문자열을 build_pwd_context 인자로 변환"""
+    scheme, *costs = spec.split(":")
+    if scheme == "bcrypt":
+        return {"scheme": "bcrypt", "bcrypt_rounds": int(costs[0]) if costs else 12}
+    if scheme == "argon2":
+        time_cost, memory_cost, parallelism = (list(map(int, costs)) + [3, 65536, 4][len(costs):])[:3]
+        return {
+            "scheme": "argon2",
+            "argon2_time_cost": time_cost,
+            "argon2_memory_cost": memory_cost,
+            "argon2_parallelism": parallelism,
+        }
+    raise ValueError(f"알 수 없는 설정입니다: {spec}")
+
+def hash_throughput(context, hashes: int, workers: int) -> dict:
+    """해싱 워커 수만큼 병렬로 해싱했을 때의 처리량"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        list(executor.map(context.hash, (f"benchpass{i}" for i in range(hashes))))
+        elapsed = time.perf_counter() - started
+    return {
+        "hashes": hashes,
+        "workers": workers,
+        "hashes_per_second": round(hashes / elapsed, 1),
+        "ms_per_hash": round(elapsed / hashes * workers * 1000, 2),
+    }
+
+async def login_latency(client, index: int, logins: int, concurrency: int) -> dict:
+    """현재 해싱 설정으로 가입한 사용자의 동시 로그인 지연 시간"""
+    user_id = f"hashbench{index}"
+    password = "benchpass123"
+    await client.post("/register", json={"id": user_id, "password": password})
+
+    async def login(i: int) -> bool:
+        response = await client.post("/token", data={"username": user_id, "password": password})
+        return response.status_code == 200
+
+    return await run_concurrent(login, logins, concurrency)
+
+async def main_async(args):
+    import security
+    from hashing import HASH_WORKERS
+
+    results = []
+    async with app_client() as client:
+        for index, spec in enumerate(args.configs.split(",")):
+            try:
+                context = security.build_pwd_context(**parse_config(spec))
+            except RuntimeError as e:
+                results.append({"config": spec, "skipped": str(e)})
+                continue
+            security.pwd_context = context
+            results.append({
+                "config": spec,
+                "hash_throughput": hash_throughput(context, args.hashes, args.workers or HASH_WORKERS),
+                "login": await login_latency(client, index, args.logins, args.concurrency),
+            })
+
+    print("🔑 패스워드 해싱 벤치마크 결과")
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="패스워드 해싱 설정별 벤치마크")
+    parser.add_argument("--configs", default="bcrypt:10,bcrypt:12,argon2:3:65536:4")
+    parser.add_argument("--hashes", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None, help="해싱 처리량 측정 스레드 수 (기본값 HASH_WORKERS)")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 로그인 수 (HASH_MAX_PENDING 초과 시 503 발생)")
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.db_url)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+포트폴리오 평가 벤치마크 - 수천 종목을 보유한 사용자의 평가 조회 시간 측정
+조인 쿼리 1회(현재 구현)와 종목별 Stock 조회(N+1) 방식을 비교
+사용법: python -m benchmarks.bench_portfolio [--positions 5000] [--repeat 20] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import app_client, configure_database, percentile, register_user
+
+async def seed_positions(user_id: int, positions: int):
+    """종목과 보유 내역을 일괄 삽입"""
+    from sqlalchemy import insert
+    from database import get_engine
+    from models import Stock, StockOwnership
+
+    async with get_engine().sessionmaker()() as db:
+        await db.execute(
+            insert(Stock),
+            [{"j_id": i, "name": f"종목{i}", "price": 100 + i % 50} for i in range(1, positions + 1)],
+        )
+        await db.execute(
+            insert(StockOwnership),
+            [
+                {"user_id": user_id, "j_id": i, "price_at_time": 100, "quantity": 1 + i % 7}
+                for i in range(1, positions + 1)
+            ],
+        )
+        await db.commit()
+
+async def naive_valuation(user_id: int) -> float:
+    """비교용 N+1 방식 - 보유 내역 조회 후 종목마다 Stock 조회"""
+    from sqlalchemy import select
+    from database import get_engine
+    from models import Stock, StockOwnership
+
+    async with get_engine().sessionmaker()() as db:
+        ownerships = (await db.execute(select(StockOwnership).where(StockOwnership.user_id == user_id))).scalars().all()
+        total = 0.0
+        for ownership in ownerships:
+            price = (await db.execute(select(Stock.price).where(Stock.j_id == ownership.j_id))).scalar_one()
+            total += float(price) * ownership.quantity
+        return total
+
+async def timed(operation, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - started)
+    return {
+        "runs": repeat,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+async def main_async(args):
+    async with app_client() as client:
+        headers = await register_user(client, "portfoliobench")
+        user_id = (await client.get("/users/me", headers=headers)).json()["user_id"]
+        await seed_positions(user_id, args.positions)
+
+        async def joined():
+            response = await client.get("/users/me/portfolio", headers=headers)
+            assert len(response.json()["holdings"]) == args.positions
+
+        result = {
+            "positions": args.positions,
+            "joined_query_endpoint": await timed(joined, args.repeat),
+            "naive_n_plus_1": await timed(lambda: naive_valuation(user_id), max(1, args.repeat // 10)),
+        }
+
+    print("📊 포트폴리오 평가 벤치마크 결과")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="포트폴리오 평가 벤치마크")
+    parser.add_argument("--positions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.db_url)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+실시간 스트림 유휴 연결 벤치마크 - 워커 하나에 유휴 SSE 연결 N개를 유지할 때의
+연결당 메모리와 시세 1건 팬아웃(전체 연결 전달) 시간 측정
+사용법: python -m benchmarks.bench_stream_connections [--connections 10000] [--stocks 10]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from pubsub import PubSubHub, price_topic, sse_events, wallet_topic
+
+async def open_connections(hub: PubSubHub, connections: int, stocks: int, on_price=None):
+    """실제 SSE 엔드포인트와 같은 제너레이터를 소비하는 유휴 연결 N개 생성"""
+    async def connection(user_id: int):
+        topics = [wallet_topic(user_id), price_topic(user_id % stocks)]
+        async for event in sse_events(hub, topics, keepalive=3600):
+            if on_price is not None and event.startswith("event: price"):
+                on_price()
+
+    tasks = [asyncio.create_task(connection(user_id)) for user_id in range(connections)]
+    while hub.subscriptions < connections:
+        await asyncio.sleep(0.01)
+    return tasks
+
+async def close_connections(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def measure_memory(args) -> int:
+    """연결당 메모리 (tracemalloc 기준, 시간 측정과 분리)"""
+    hub = PubSubHub()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = await open_connections(hub, args.connections, args.stocks)
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    await close_connections(tasks)
+    return memory // args.connections
+
+async def main_async(args):
+    memory_per_connection = await measure_memory(args)
+
+    hub = PubSubHub()
+    expected = len(range(0, args.connections, args.stocks))
+    received = 0
+    all_received = asyncio.Event()
+
+    def on_price():
+        nonlocal received
+        received += 1
+        if received == expected:
+            all_received.set()
+
+    started = time.perf_counter()
+    tasks = await open_connections(hub, args.connections, args.stocks, on_price)
+    setup_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    delivered = hub.publish(price_topic(0), {"type": "price", "j_id": 0, "price": 1.0})
+    publish_seconds = time.perf_counter() - started
+    await all_received.wait()
+    fanout_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user_id in range(args.connections):
+        hub.publish(wallet_topic(user_id), {"type": "wallet", "user_id": user_id, "money": 1.0})
+    wallet_publish_seconds = time.perf_counter() - started
+
+    await close_connections(tasks)
+
+    result = {
+        "connections": args.connections,
+        "setup_seconds": round(setup_seconds, 3),
+        "memory_per_connection_bytes": memory_per_connection,
+        "price_fanout_subscribers": delivered,
+        "price_publish_ms": round(publish_seconds * 1000, 3),
+        "price_fanout_delivered_ms": round(fanout_seconds * 1000, 3),
+        "wallet_publish_per_message_us": round(wallet_publish_seconds / args.connections * 1e6, 3),
+        "subscriptions_after_close": hub.subscriptions,
+    }
+    print("📡 유휴 스트림 연결 벤치마크 결과")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="실시간 스트림 유휴 연결 벤치마크")
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--stocks", type=int, default=10, help="연결들이 나눠 구독할 종목 수")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
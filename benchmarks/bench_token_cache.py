@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+JWT 검증 캐시 마이크로벤치마크 - 캐시 사용/미사용 검증 처리량 비교
+사용법: python -m benchmarks.bench_token_cache [--iterations 50000] [--tokens 100]
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from security import create_access_token, decode_access_token, token_cache
+
+def run(iterations: int, distinct_tokens: int, use_cache: bool) -> float:
+    """검증 처리량(회/초) 측정"""
+    tokens = [
+        create_access_token({"sub": f"benchuser{i}"}, expires_delta=timedelta(minutes=30))
+        for i in range(distinct_tokens)
+    ]
+    token_cache.clear()
+    started = time.perf_counter()
+    for i in range(iterations):
+        assert decode_access_token(tokens[i % distinct_tokens], use_cache=use_cache) is not None
+    elapsed = time.perf_counter() - started
+    return iterations / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT 검증 캐시 마이크로벤치마크")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--tokens", type=int, default=100, help="서로 다른 토큰 개수")
+    args = parser.parse_args()
+
+    uncached = run(args.iterations, args.tokens, use_cache=False)
+    cached = run(args.iterations, args.tokens, use_cache=True)
+    print(f"🔐 캐시 미사용: {uncached:,.0f} 회/초")
+    print(f"⚡ 캐시 사용:   {cached:,.0f} 회/초")
+    print(f"📈 속도 향상:   {cached / uncached:.1f}배")
+    print(f"📊 캐시 지표:   {token_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
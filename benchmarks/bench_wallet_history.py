@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+지갑 거래 내역 벤치마크 - 대용량 원장에서 깊은 페이지까지 내려갈 때의 페이지 조회 시간 측정
+키셋 커서(현재 구현)와 OFFSET 방식을 같은 깊이에서 비교
+사용법: python -m benchmarks.bench_wallet_history [--entries 200000] [--page-size 50] [--depths 0,100,500,999] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import app_client, configure_database, percentile, register_user
+
+async def seed_ledger(user_id: int, entries: int, other_users: int, chunk: int = 10000):
+    """대상 사용자와 다른 사용자들의 원장 기록을 섞어서 일괄 삽입"""
+    from sqlalchemy import insert, select
+    from database import get_engine
+    from models import User, WalletLedger
+
+    async with get_engine().sessionmaker()() as db:
+        if other_users:
+            await db.execute(insert(User), [{"id": f"ledgernoise{i}", "password": "x"} for i in range(other_users)])
+        result = await db.execute(select(User.user_id).where(User.id.like("ledgernoise%")))
+        owners = [user_id] + list(result.scalars().all())
+        for start in range(0, entries, chunk):
+            await db.execute(
+                insert(WalletLedger),
+                [
+                    {
+                        "user_id": owners[i % len(owners)],
+                        "amount": 10,
+                        "balance_after": 10 * (i + 1),
+                        "kind": "credit",
+                    }
+                    for i in range(start, min(start + chunk, entries))
+                ],
+            )
+        await db.commit()
+
+async def keyset_page(user_id: int, page_size: int, cursor) -> int:
+    """현재 구현 - (user_id, id) 인덱스에서 커서 위치부터 바로 읽음"""
+    from database import get_engine
+    from wallet import get_wallet_history
+
+    async with get_engine().sessionmaker()() as db:
+        return len((await get_wallet_history(db, user_id, page_size, cursor)).entries)
+
+async def offset_page(user_id: int, page_size: int, offset: int) -> int:
+    """비교용 OFFSET 방식 - 건너뛴 행을 모두 읽은 뒤 버림"""
+    from sqlalchemy import select
+    from database import get_engine
+    from models import WalletLedger
+
+    async with get_engine().sessionmaker()() as db:
+        result = await db.execute(
+            select(WalletLedger)
+            .where(WalletLedger.user_id == user_id)
+            .order_by(WalletLedger.id.desc())
+            .offset(offset)
+            .limit(page_size)
+        )
+        return len(result.scalars().all())
+
+async def timed(operation, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - started)
+    return {
+        "runs": repeat,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+async def main_async(args):
+    depths = [int(depth) for depth in args.depths.split(",")]
+    async with app_client() as client:
+        headers = await register_user(client, "ledgerbench")
+        user_id = (await client.get("/users/me", headers=headers)).json()["user_id"]
+        await seed_ledger(user_id, args.entries, args.other_users)
+
+        # 키셋 방식으로 끝까지 내려가며 각 깊이의 커서를 수집
+        cursors = {0: None}
+        cursor, page = None, 0
+        while True:
+            params = {"limit": args.page_size}
+            if cursor is not None:
+                params["cursor"] = cursor
+            body = (await client.get("/users/me/wallet/history", params=params, headers=headers)).json()
+            page += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+            cursors[page] = cursor
+
+        results = []
+        for depth in depths:
+            if depth not in cursors:
+                continue
+
+            async def keyset(depth=depth):
+                params = {"limit": args.page_size}
+                if cursors[depth] is not None:
+                    params["cursor"] = cursors[depth]
+                response = await client.get("/users/me/wallet/history", params=params, headers=headers)
+                assert response.status_code == 200
+
+            results.append({
+                "page": depth,
+                "keyset_endpoint": await timed(keyset, args.repeat),
+                "keyset_query": await timed(lambda depth=depth: keyset_page(user_id, args.page_size, cursors[depth]), args.repeat),
+                "offset_query": await timed(lambda depth=depth: offset_page(user_id, args.page_size, depth * args.page_size), args.repeat),
+            })
+
+    result = {
+        "entries": args.entries,
+        "user_pages": page,
+        "page_size": args.page_size,
+        "depths": results,
+    }
+    print("📊 지갑 거래 내역 페이지네이션 벤치마크 결과")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="지갑 거래 내역 페이지네이션 벤치마크")
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--other-users", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depths", default="0,100,500,999")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.db_url)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
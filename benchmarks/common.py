@@ -0,0 +1,114 @@
+"""
+벤치마크 공통 도구 - 앱을 프로세스 내(ASGI)에서 실행하고 지연 시간 통계를 계산
+DB_URL을 지정하지 않으면 임시 SQLite 파일을 사용
+"""
+
+import asyncio
+import math
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+
+def configure_database(db_url: Optional[str] = None) -> str:
+    """벤치마크 대상 DB_URL(과 요청 제한 설정) 지정 - 앱 모듈을 import하기 전에 호출"""
+    if db_url is None:
+        db_url = os.environ.get("DB_URL")
+    if db_url is None:
+        db_dir = tempfile.mkdtemp(prefix="khackarthon-bench-")
+        db_url = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    os.environ["DB_URL"] = db_url
+    # 부하는 모두 같은 클라이언트 주소에서 발생하므로 로그인/회원가입 요청 제한은 기본적으로 끔
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    return db_url
+
+async def reset_schema():
+    """모든 테이블을 삭제 후 다시 생성"""
+    from database import get_engine
+    from models import Base
+
+    async with get_engine().engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+@asynccontextmanager
+async def app_client():
+    """lifespan이 적용된 앱에 연결된 비동기 HTTP 클라이언트"""
+    from app import app, lifespan
+
+    async with lifespan(app):
+        await reset_schema()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+async def register_user(client: httpx.AsyncClient, user_id: str, password: str = "benchpass123") -> dict:
+    """회원가입 후 로그인하여 Authorization 헤더 반환"""
+    await client.post("/register", json={"id": user_id, "password": password})
+    response = await client.post("/token", data={"username": user_id, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def add_stock(name: str, price: float) -> int:
+    """주식 데이터 추가 후 j_id 반환"""
+    from database import get_engine
+    from models import Stock
+
+    async with get_engine().sessionmaker()() as db:
+        stock = Stock(name=name, price=price)
+        db.add(stock)
+        await db.commit()
+        return stock.j_id
+
+def percentile(samples: List[float], p: float) -> float:
+    """최근접 순위 방식 백분위수 - 표본의 p% 이상이 이 값 이하가 되는 가장 작은 표본 (순위 = ceil(p/100 * n))"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # p * n을 먼저 곱해 부동소수점 오차로 순위가 한 칸 밀리지 않게 함 (예: 0.07 * 100 = 7.000000000000001)
+    rank = max(0, math.ceil(p * len(ordered) / 100) - 1)
+    return ordered[rank]
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> dict:
+    """처리량과 지연 시간 백분위수(ms) 요약"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+    }
+
+async def run_concurrent(
+    operation: Callable[[int], Awaitable[bool]],
+    total: int,
+    concurrency: int,
+) -> dict:
+    """operation(i)를 total번, 최대 concurrency개씩 동시에 실행하고 요약 반환
+
+    operation은 성공 여부를 반환하며, 예외나 False는 오류로 집계
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                ok = await operation(i)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
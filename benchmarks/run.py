@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+기준선 벤치마크 스위트 - 주요 API 시나리오를 프로세스 내에서 동시 실행하고 결과를 JSON으로 저장
+시나리오: register, login, wallet_read, wallet_credit, authenticated_read
+시나리오마다 처리량(req/s), p50/p95/p99 지연 시간, 요청당 SQL 문장 수를 기록하며
+--baseline으로 이전 결과 파일을 지정하면 항목별 변화율을 함께 출력
+사용법: python -m benchmarks.run [--requests 500] [--auth-requests 100] [--concurrency 16]
+        [--scenarios register,login,...] [--output results.json] [--baseline old.json] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks.common import app_client, configure_database, register_user, run_concurrent
+
+SCENARIOS = ("register", "login", "wallet_read", "wallet_credit", "authenticated_read")
+# 패스워드 해싱이 포함되어 요청당 비용이 큰 시나리오 (--auth-requests 적용)
+HASHING_SCENARIOS = ("register", "login")
+# 비교 시 높을수록 좋은 항목과 낮을수록 좋은 항목
+HIGHER_IS_BETTER = ("rps",)
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "statements_per_request")
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+async def measure(operation: Callable[[int], Awaitable[bool]], total: int, concurrency: int) -> dict:
+    """run_concurrent 요약에 요청당 SQL 문장 수 추가 - 요청마다 별도 프로파일로 집계"""
+    from profiler import QueryProfile, current_profile
+
+    statements: List[int] = []
+
+    async def profiled(i: int) -> bool:
+        # 앱은 같은 태스크에서 실행되므로(ASGITransport) 요청의 SQL이 이 프로파일에 기록됨
+        profile = QueryProfile("benchmark")
+        token = current_profile.set(profile)
+        try:
+            return await operation(i)
+        finally:
+            current_profile.reset(token)
+            statements.append(len(profile.statements))
+
+    result = await run_concurrent(profiled, total, concurrency)
+    result["concurrency"] = concurrency
+    result["statements_per_request"] = round(sum(statements) / len(statements), 2) if statements else 0.0
+    return result
+
+async def run_scenarios(args) -> Dict[str, dict]:
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+
+    results = {}
+    async with app_client() as client:
+        # 로그인/지갑/인증 조회 시나리오가 공유하는 사용자 (준비 과정은 측정하지 않음)
+        users = [f"benchuser{i}" for i in range(args.users)]
+        headers = [await register_user(client, user_id) for user_id in users]
+        for user_headers in headers:
+            await client.put("/users/me/wallet/add?amount=1000", headers=user_headers)
+
+        async def register(i: int) -> bool:
+            response = await client.post("/register", json={"id": f"benchreg{i}", "password": "benchpass123"})
+            return response.status_code == 201
+
+        async def login(i: int) -> bool:
+            response = await client.post(
+                "/token", data={"username": users[i % len(users)], "password": "benchpass123"}
+            )
+            return response.status_code == 200
+
+        async def wallet_read(i: int) -> bool:
+            response = await client.get("/users/me/wallet", headers=headers[i % len(headers)])
+            return response.status_code == 200
+
+        async def wallet_credit(i: int) -> bool:
+            response = await client.put("/users/me/wallet/add?amount=1", headers=headers[i % len(headers)])
+            return response.status_code == 200
+
+        async def authenticated_read(i: int) -> bool:
+            response = await client.get("/users/me", headers=headers[i % len(headers)])
+            return response.status_code == 200
+
+        operations = {
+            "register": register,
+            "login": login,
+            "wallet_read": wallet_read,
+            "wallet_credit": wallet_credit,
+            "authenticated_read": authenticated_read,
+        }
+        for name in scenarios:
+            total = args.auth_requests if name in HASHING_SCENARIOS else args.requests
+            # 예열 - 캐시/커넥션 풀이 채워진 정상 상태를 측정
+            for i in range(min(args.warmup, total)):
+                await operations[name](total + i)
+            results[name] = await measure(operations[name], total, args.concurrency)
+    return results
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, dict]:
+    """시나리오/항목별 기준선 대비 변화율(%) - 양수가 개선"""
+    changes = {}
+    for name, result in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        changes[name] = {}
+        for key in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            before, after = old.get(key), result.get(key)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            # + 0.0: 변화가 없을 때 -0.0 대신 0.0으로 표시
+            changes[name][key] = round(change if key in HIGHER_IS_BETTER else -change, 1) + 0.0
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description="기준선 벤치마크 스위트")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="시나리오별 요청 수")
+    parser.add_argument("--auth-requests", type=int, default=100, help="register/login 시나리오 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=8, help="로그인/지갑 시나리오가 나눠 쓰는 사용자 수")
+    parser.add_argument("--warmup", type=int, default=10, help="시나리오별 측정 전 예열 요청 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    db_url = configure_database(args.db_url)
+
+    started = time.time()
+    scenarios = asyncio.run(run_scenarios(args))
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started)),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": db_url.split(":", 1)[0],
+            "concurrency": args.concurrency,
+        },
+        "scenarios": scenarios,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline_revision"] = baseline.get("meta", {}).get("revision")
+        report["change_percent"] = compare(scenarios, baseline.get("scenarios", {}))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional
+
+from sqlalchemy import select
+
+from config import settings
+from database import get_read_engine
+from models import Stock, StockResponse
+
+# 주식 목록 스냅샷 갱신 주기(초)
+STOCK_CATALOG_REFRESH_SECONDS = settings.stock_catalog_refresh_seconds
+
+class StockCatalog:
+    """stock 테이블의 프로세스 로컬 스냅샷 - 캐시 적중 시 DB를 조회하지 않음
+
+    첫 조회 시 지연 로딩하고, 갱신 주기가 지나거나 invalidate()로 무효화되면 다시 로딩
+    가격 변경은 apply_prices()로 스냅샷에 바로 반영
+    """
+
+    def __init__(self, refresh_interval: float = STOCK_CATALOG_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self.reset()
+
+    def reset(self):
+        """스냅샷과 지표 초기화 (애플리케이션 시작 시 호출)"""
+        self._stocks: Dict[int, StockResponse] = {}
+        self._summaries: List[StockResponse] = []
+        self._details: List[StockResponse] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_interval
+
+    def invalidate(self):
+        """다음 조회 시 다시 로딩하도록 무효화"""
+        self._loaded_at = None
+
+    async def reload(self):
+        """stock 테이블 전체를 읽어 스냅샷 교체 (복제본이 있으면 복제본에서 조회)"""
+        SessionLocal = get_read_engine().sessionmaker()
+        async with SessionLocal() as db:
+            result = await db.execute(select(Stock).order_by(Stock.j_id))
+            stocks = result.scalars().all()
+        self._set_snapshot([StockResponse.model_validate(stock) for stock in stocks])
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+
+    def _set_snapshot(self, details: List[StockResponse]):
+        # 목록 응답용 요약(설명 제외)을 미리 만들어 두어 조회 시 복사 비용이 없도록 함
+        self._details = details
+        self._summaries = [detail.model_copy(update={"explanation": None}) for detail in details]
+        self._stocks = {detail.j_id: detail for detail in details}
+
+    async def _ensure_loaded(self):
+        if not self.is_stale():
+            self.hits += 1
+            return
+        async with self._lock:
+            if self.is_stale():
+                await self.reload()
+            else:
+                self.hits += 1
+
+    async def list_stocks(self, include_explanation: bool = False) -> List[StockResponse]:
+        """전체 주식 목록"""
+        await self._ensure_loaded()
+        return self._details if include_explanation else self._summaries
+
+    async def get_stock(self, j_id: int) -> Optional[StockResponse]:
+        """j_id로 주식 조회"""
+        await self._ensure_loaded()
+        return self._stocks.get(j_id)
+
+    def apply_prices(self, prices: Mapping[int, Decimal]):
+        """변경된 가격을 스냅샷에 반영 (스냅샷에 없는 종목이 있으면 무효화)"""
+        if self._loaded_at is None:
+            return
+        if any(j_id not in self._stocks for j_id in prices):
+            self.invalidate()
+            return
+        details = [
+            detail.model_copy(update={"price": float(prices[detail.j_id])}) if detail.j_id in prices else detail
+            for detail in self._details
+        ]
+        self._set_snapshot(details)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._stocks),
+            "hits": self.hits,
+            "loads": self.loads,
+            "refresh_interval_seconds": self.refresh_interval,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 3) if self._loaded_at is not None else None,
+        }
+
+# 애플리케이션 전역 주식 목록 캐시
+stock_catalog = StockCatalog()
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import tempfile
+
+# 테스트는 로컬 SQLite 파일 DB를 사용 (MySQL 서버 불필요, aiosqlite 비동기 드라이버)
+_db_dir = tempfile.mkdtemp(prefix="khackarthon-test-")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}")
+os.environ.setdefault("ADMIN_API_KEY", "test-admin-key")
+# 모든 테스트 요청이 같은 클라이언트 주소에서 오므로 요청 제한은 해당 테스트에서만 켬
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import engineconn
+from models import Base
+
+async def _reset_schema():
+    # 별도 엔진으로 스키마를 초기화한 뒤 정리 (앱 엔진은 lifespan에서 생성)
+    engine = engineconn()
+    async with engine.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+@pytest.fixture
+def client():
+    """테이블이 생성된 상태의 테스트 클라이언트"""
+    from app import app
+
+    asyncio.run(_reset_schema())
+    with TestClient(app) as test_client:
+        yield test_client
+
+def register_and_login(client, user_id: str, password: str = "testpass123") -> dict:
+    """회원가입 후 로그인하여 Authorization 헤더 반환"""
+    client.post("/register", json={"id": user_id, "password": password})
+    response = client.post("/token", data={"username": user_id, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+ADMIN_HEADERS = {"X-Admin-Key": "test-admin-key"}
+
+def run_in_db(func):
+    """별도 엔진의 세션으로 비동기 함수 실행 (테스트 데이터 준비/검증용)"""
+    async def runner():
+        engine = engineconn()
+        try:
+            async with engine.sessionmaker()() as db:
+                return await func(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+def add_stocks(*stocks):
+    """주식 데이터 추가 - (이름, 가격[, 설명]) 튜플 목록, 생성된 j_id 목록 반환"""
+    from models import Stock
+
+    async def insert(db):
+        rows = [Stock(name=stock[0], price=stock[1], explanation=stock[2] if len(stock) > 2 else None) for stock in stocks]
+        db.add_all(rows)
+        await db.commit()
+        return [row.j_id for row in rows]
+
+    return run_in_db(insert)
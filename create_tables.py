@@ -1,11 +1,23 @@
-from database import engineconn
+import asyncio
+
+from database import get_engine, dispose_engine
 from models import Base
 
+async def create_all_tables(engine):
+    """주어진 엔진에 모든 테이블 생성"""
+    async with engine.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def _create_tables():
+    try:
+        await create_all_tables(get_engine())
+    finally:
+        await dispose_engine()
+
 def create_tables():
     """데이터베이스 테이블 생성"""
     try:
-        engine = engineconn()
-        Base.metadata.create_all(bind=engine.engine)
+        asyncio.run(_create_tables())
         print("✅ 데이터베이스 테이블이 성공적으로 생성되었습니다.")
     except Exception as e:
         print(f"❌ 테이블 생성 중 오류가 발생했습니다: {str(e)}")
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from config import settings
+from metrics import password_hash_seconds, password_hash_wait_seconds
+
+# 패스워드 해싱 전용 워커 풀 설정
+# bcrypt는 해싱 중 GIL을 해제하므로 스레드 풀로도 이벤트 루프를 막지 않고 병렬 처리 가능
+HASH_WORKERS = settings.hash_workers
+HASH_MAX_PENDING = settings.hash_max_pending
+
+class TimingStats:
+    """소요 시간 누적 통계 (횟수/합계/최대)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+class HashExecutor:
+    """대기열 길이가 제한된 해싱 전용 실행기 - 포화 시 즉시 503 반환"""
+
+    def __init__(self, workers: int = HASH_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.wait = TimingStats()
+        self.run_time = TimingStats()
+
+    @property
+    def capacity(self) -> int:
+        """실행 중 + 대기 중 작업의 최대 개수"""
+        return self.workers + self.max_pending
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hash")
+            return self._pool
+
+    async def run(self, func, *args):
+        """해싱 함수를 워커 풀에서 실행하고 결과를 기다림"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="인증 요청이 많아 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._in_flight -= 1
+                    self.wait.observe(started - submitted)
+                    self.run_time.observe(finished - started)
+                password_hash_wait_seconds.observe(value=started - submitted)
+                password_hash_seconds.observe(func.__name__, value=finished - started)
+
+        try:
+            future = self._get_pool().submit(task)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """대기/실행 시간 및 포화 지표"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "wait": self.wait.as_dict(),
+                "run": self.run_time.as_dict(),
+            }
+
+    def shutdown(self):
+        """워커 풀 종료 - 다음 요청 시 다시 생성"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+# 애플리케이션 전역 해싱 실행기
+hash_executor = HashExecutor()
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache import TTLCache
+from config import settings
+from database import get_engine
+from models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+# 완료된 응답을 보관하는 인메모리 LRU 크기와 보관 시간
+IDEMPOTENCY_CACHE_SIZE = settings.idempotency_cache_size
+IDEMPOTENCY_TTL = settings.idempotency_ttl
+# 여러 워커로 배포할 때 "database"로 지정하면 idempotency_key 테이블을 공유 저장소로 사용
+IDEMPOTENCY_STORE = settings.idempotency_store
+IDEMPOTENCY_PURGE_SECONDS = settings.idempotency_purge_seconds
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+def request_fingerprint(*parts) -> str:
+    """같은 키로 다른 요청을 보냈는지 판별하기 위한 요청 내용 해시"""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+class IdempotencyStore:
+    """Idempotency-Key 중복 제거 저장소
+
+    완료된 응답은 (user_id, key) 단위로 인메모리 LRU+TTL 캐시에 보관하고,
+    DB 저장소를 켜면 변경과 같은 트랜잭션에서 idempotency_key 행을 삽입해
+    다른 워커의 재시도도 한 번만 반영되도록 보장
+    """
+
+    def __init__(self, maxsize: int = IDEMPOTENCY_CACHE_SIZE, ttl: float = IDEMPOTENCY_TTL, use_db: bool = IDEMPOTENCY_STORE == "database"):
+        self.ttl = ttl
+        self.use_db = use_db
+        self.cache = TTLCache(maxsize, ttl)
+        self.reset()
+
+    def reset(self):
+        """상태와 지표 초기화 (애플리케이션 시작 시 호출)"""
+        self.cache.clear()
+        self._in_flight = set()
+        self.executed = 0
+        self.replays = 0
+        self.conflicts = 0
+        self.mismatches = 0
+
+    def _replay(self, record: Tuple[str, str], fingerprint: str, response_model: Type[ResponseT]) -> ResponseT:
+        stored_fingerprint, body = record
+        if stored_fingerprint != fingerprint:
+            self.mismatches += 1
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="같은 Idempotency-Key가 다른 요청에 사용되었습니다."
+            )
+        self.replays += 1
+        return response_model.model_validate_json(body)
+
+    async def _load(self, db: AsyncSession, user_id: int, key: str) -> Optional[Tuple[str, str]]:
+        """DB에 저장된 완료 응답 조회 - 만료된 행은 같은 트랜잭션에서 삭제"""
+        result = await db.execute(
+            select(IdempotencyRecord.fingerprint, IdempotencyRecord.response_body, IdempotencyRecord.expires_at)
+            .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        if row.expires_at <= datetime.utcnow():
+            await db.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+            )
+            return None
+        return row.fingerprint, row.response_body
+
+    async def execute(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        key: Optional[str],
+        fingerprint: str,
+        response_model: Type[ResponseT],
+        operation: Callable[[], Awaitable[ResponseT]],
+    ) -> Tuple[ResponseT, bool]:
+        """변경 작업을 최대 한 번 실행하고 커밋 - (응답, 재응답 여부) 반환
+
+        operation은 커밋하지 않고 응답 모델을 반환해야 하며, 실패 시 롤백은 호출자가 수행
+        키가 없으면 중복 제거 없이 실행 후 커밋
+        """
+        if key is None:
+            response = await operation()
+            await db.commit()
+            return response, False
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key는 1~{IDEMPOTENCY_KEY_MAX_LENGTH}자여야 합니다."
+            )
+
+        cache_key = (user_id, key)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return self._replay(cached, fingerprint, response_model), True
+        if cache_key in self._in_flight:
+            self.conflicts += 1
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="같은 Idempotency-Key 요청이 처리 중입니다."
+            )
+
+        self._in_flight.add(cache_key)
+        try:
+            if self.use_db:
+                record = await self._load(db, user_id, key)
+                if record is not None:
+                    response = self._replay(record, fingerprint, response_model)
+                    self.cache.set(cache_key, record)
+                    return response, True
+
+            response = await operation()
+            body = response.model_dump_json()
+            try:
+                if self.use_db:
+                    await db.execute(insert(IdempotencyRecord).values(
+                        user_id=user_id,
+                        key=key,
+                        fingerprint=fingerprint,
+                        response_body=body,
+                        expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+                    ))
+                await db.commit()
+            except IntegrityError:
+                # 다른 워커가 같은 키를 먼저 커밋함 - 이번 변경은 버리고 먼저 저장된 응답을 재응답
+                await db.rollback()
+                record = await self._load(db, user_id, key)
+                if record is None:
+                    raise
+                self.cache.set(cache_key, record)
+                return self._replay(record, fingerprint, response_model), True
+
+            self.executed += 1
+            self.cache.set(cache_key, (fingerprint, body))
+            return response, False
+        finally:
+            self._in_flight.discard(cache_key)
+
+    async def purge_expired(self) -> int:
+        """만료된 DB 저장 행 삭제"""
+        async with get_engine().sessionmaker()() as db:
+            result = await db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= datetime.utcnow()))
+            await db.commit()
+            return result.rowcount
+
+    async def run_periodic_purge(self, interval: float = IDEMPOTENCY_PURGE_SECONDS):
+        """주기적 만료 행 정리 루프 (DB 저장소 사용 시 lifespan에서 실행)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.purge_expired()
+            except Exception:
+                logger.exception("Idempotency-Key 만료 행 정리 실패")
+
+    def stats(self) -> dict:
+        """중복 제거 지표"""
+        return {
+            "store": "database" if self.use_db else "memory",
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "replays": self.replays,
+            "conflicts": self.conflicts,
+            "mismatches": self.mismatches,
+            "cache": self.cache.stats(),
+        }
+
+# 애플리케이션 전역 중복 제거 저장소
+idempotency_store = IdempotencyStore()
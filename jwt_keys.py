@@ -0,0 +1,210 @@
+import asyncio
+import glob
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from jose import jwk, jwt
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 비대칭 서명 키 디렉터리 - <kid>.pem(PKCS#8 개인 키) 파일들을 읽으며, 파일 이름 순으로 가장 마지막 키로 서명
+# 다른 워커가 추가한 키는 주기적으로, 또는 모르는 kid의 토큰을 검증할 때 다시 읽음
+JWT_KEYS_DIR = settings.jwt_keys_dir
+JWT_ACTIVE_KID = settings.jwt_active_kid  # 지정 시 이 kid로 서명
+JWT_KEYS_RELOAD_SECONDS = settings.jwt_keys_reload_seconds
+JWT_RSA_KEY_SIZE = settings.jwt_rsa_key_size
+# 모르는 kid 때문에 디렉터리를 다시 읽는 최소 간격 (임의 kid 토큰으로 파일 시스템을 두드리는 것 방지)
+UNKNOWN_KID_RELOAD_INTERVAL = 5.0
+
+SYMMETRIC_ALGORITHMS = ("HS256",)
+ASYMMETRIC_ALGORITHMS = ("RS256",)
+
+def generate_rsa_private_key_pem(key_size: int = JWT_RSA_KEY_SIZE) -> str:
+    """RSA 개인 키를 PKCS#8 PEM으로 생성"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+def new_kid() -> str:
+    """파일 이름 순서가 생성 순서와 같도록 시각을 앞에 둔 kid"""
+    return f"{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}-{secrets.token_hex(4)}"
+
+class JWTKey:
+    """서명/검증 키 - 키 재료는 생성 시 한 번만 파싱하여 검증마다 PEM을 다시 읽지 않음"""
+
+    def __init__(self, kid: str, algorithm: str, material: str):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.signing_key = jwk.construct(material, algorithm)
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            self.verify_key = self.signing_key.public_key()
+            self.public_jwk = {**self.verify_key.to_dict(), "kid": kid, "use": "sig"}
+        else:
+            self.verify_key = self.signing_key
+            self.public_jwk = None  # 대칭 키는 공개하지 않음
+
+class KeyRing:
+    """JWT 서명 키 묶음 - 활성 키로 서명하고 kid 헤더로 검증 키를 선택
+
+    키 회전은 새 키를 추가해 활성 키로 바꾸는 방식이며, 이전 키는 발급된 토큰이 만료될 때까지
+    검증용으로 남겨 두었다가 retire()로 제거
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: Optional[str] = None,
+        keys_dir: Optional[str] = JWT_KEYS_DIR,
+        active_kid: Optional[str] = JWT_ACTIVE_KID,
+    ):
+        if algorithm not in SYMMETRIC_ALGORITHMS + ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"지원하지 않는 JWT 서명 알고리즘입니다: {algorithm} (HS256 또는 RS256)")
+        self.algorithm = algorithm
+        self.secret = secret
+        self.keys_dir = keys_dir
+        self.configured_active_kid = active_kid
+        self._lock = threading.Lock()
+        self._keys: Dict[str, JWTKey] = {}
+        self._active: Optional[JWTKey] = None
+        self._last_reload = 0.0
+        self.reloads = 0
+        self.unknown_kids = 0
+        self.reload()
+
+    def reload(self):
+        """키 재료를 다시 읽음 - 디렉터리에서 사라진 키도 검증 대상에서 제외"""
+        if self.algorithm in SYMMETRIC_ALGORITHMS:
+            keys = {"default": JWTKey("default", self.algorithm, self.secret)}
+            active_kid = "default"
+        elif self.keys_dir:
+            keys = {}
+            for path in sorted(glob.glob(os.path.join(self.keys_dir, "*.pem"))):
+                kid = os.path.splitext(os.path.basename(path))[0]
+                existing = self._keys.get(kid)
+                if existing is not None:
+                    keys[kid] = existing
+                    continue
+                with open(path) as f:
+                    keys[kid] = JWTKey(kid, self.algorithm, f.read())
+            if not keys:
+                kid = self._write_new_key()
+                keys[kid] = self._load_file(kid)
+            active_kid = self.configured_active_kid or max(keys)
+        else:
+            # 개발용 - 프로세스마다 다른 키가 생성되므로 재시작/다중 워커에서 토큰이 호환되지 않음
+            if self._keys:
+                return
+            logger.warning("JWT_KEYS_DIR가 설정되지 않아 임시 RSA 키를 생성합니다 (재시작 시 기존 토큰 무효화)")
+            kid = new_kid()
+            keys = {kid: JWTKey(kid, self.algorithm, generate_rsa_private_key_pem())}
+            active_kid = kid
+
+        if active_kid not in keys:
+            raise RuntimeError(f"활성 JWT 키를 찾을 수 없습니다: {active_kid}")
+        with self._lock:
+            self._keys = keys
+            self._active = keys[active_kid]
+            self._last_reload = time.monotonic()
+            self.reloads += 1
+
+    def _load_file(self, kid: str) -> JWTKey:
+        with open(os.path.join(self.keys_dir, f"{kid}.pem")) as f:
+            return JWTKey(kid, self.algorithm, f.read())
+
+    def _write_new_key(self) -> str:
+        kid = new_kid()
+        os.makedirs(self.keys_dir, exist_ok=True)
+        path = os.path.join(self.keys_dir, f"{kid}.pem")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(generate_rsa_private_key_pem())
+        return kid
+
+    @property
+    def active(self) -> JWTKey:
+        return self._active
+
+    def sign(self, claims: dict) -> str:
+        """활성 키로 서명하고 kid 헤더 추가"""
+        key = self._active
+        return jwt.encode(claims, key.signing_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def verification_key(self, kid: Optional[str]) -> Optional[JWTKey]:
+        """kid에 해당하는 파싱된 검증 키 - kid가 없는 HS256 토큰은 기본 키로 검증"""
+        if kid is None:
+            return self._active if self.algorithm in SYMMETRIC_ALGORITHMS else None
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        self.unknown_kids += 1
+        if self.keys_dir and time.monotonic() - self._last_reload >= UNKNOWN_KID_RELOAD_INTERVAL:
+            self.reload()
+            return self._keys.get(kid)
+        return None
+
+    def rotate(self) -> str:
+        """새 비대칭 키를 만들어 활성 키로 전환하고 kid 반환 (이전 키는 검증용으로 유지)"""
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError("대칭 키(HS256)는 회전할 수 없습니다. SECRET_KEY를 변경하세요.")
+        if self.keys_dir:
+            kid = self._write_new_key()
+            key = self._load_file(kid)
+        else:
+            kid = new_kid()
+            key = JWTKey(kid, self.algorithm, generate_rsa_private_key_pem())
+        with self._lock:
+            self._keys = {**self._keys, kid: key}
+            self._active = key
+        self.configured_active_kid = None
+        return kid
+
+    def retire(self, kid: str) -> bool:
+        """이전 키 제거 - 활성 키는 제거할 수 없음"""
+        if kid == self._active.kid:
+            raise ValueError("활성 키는 제거할 수 없습니다.")
+        with self._lock:
+            if kid not in self._keys:
+                return False
+            self._keys = {k: v for k, v in self._keys.items() if k != kid}
+        if self.keys_dir:
+            try:
+                os.remove(os.path.join(self.keys_dir, f"{kid}.pem"))
+            except FileNotFoundError:
+                pass
+        return True
+
+    def jwks(self) -> dict:
+        """공개 키 목록 (JWKS) - 다른 서비스가 이 API를 거치지 않고 토큰을 검증할 때 사용"""
+        return {"keys": [key.public_jwk for key in self._keys.values() if key.public_jwk is not None]}
+
+    async def run_periodic_reload(self, interval: float = JWT_KEYS_RELOAD_SECONDS):
+        """주기적 키 디렉터리 재조회 루프 (JWT_KEYS_DIR 사용 시 lifespan에서 실행)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception:
+                logger.exception("JWT 키 재조회 실패")
+
+    def stats(self) -> dict:
+        """키 묶음 지표"""
+        return {
+            "algorithm": self.algorithm,
+            "active_kid": self._active.kid if self.algorithm in ASYMMETRIC_ALGORITHMS else None,
+            "keys": len(self._keys),
+            "reloads": self.reloads,
+            "unknown_kids": self.unknown_kids,
+        }
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import random
+import threading
+from decimal import Decimal
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from config import settings
+from database import get_engine
+from models import LeaderboardEntry, Stock, StockOwnership, User, UserWallet
+
+logger = logging.getLogger(__name__)
+
+# 전체 재계산(드리프트 보정) 주기(초)
+LEADERBOARD_REBUILD_SECONDS = settings.leaderboard_rebuild_seconds
+
+ZERO = Decimal("0")
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * levels
+        # width[level]: 이 노드에서 next[level] 노드까지 0레벨 기준 거리
+        self.width: List[int] = [1] * levels
+
+class IndexableSkipList:
+    """순위(인덱스) 조회를 지원하는 정렬 스킵 리스트 - 삽입/삭제/순위 조회 O(log n)"""
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        self.head = _Node(None, self.MAX_LEVELS)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, key):
+        update = [self.head] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            update[level] = node
+
+        levels = self._random_levels()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = update[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            update[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        update = [self.head] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            update[level] = node
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = update[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            update[level].width[level] -= 1
+        self.size -= 1
+
+    def index(self, key) -> Optional[int]:
+        """키의 0부터 시작하는 순위 (없으면 None)"""
+        position = 0
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        target = node.next[0]
+        if target is None or target.key != key:
+            return None
+        return position
+
+    def head_items(self, limit: int) -> Iterator:
+        """앞에서부터 limit개 키"""
+        node = self.head.next[0]
+        while node is not None and limit > 0:
+            yield node.key
+            node = node.next[0]
+            limit -= 1
+
+class Leaderboard:
+    """순자산(지갑 잔액 + 보유 주식 평가액) 기준 사용자 순위
+
+    지갑/주문/가격 변경 시 증분 갱신하고, 주기적으로 DB 전체 조인으로 재계산하여 드리프트 보정
+    상위 N명 조회는 O(log n + N), 사용자 순위 조회는 O(log n)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._names: Dict[int, str] = {}
+        self._money: Dict[int, Decimal] = {}
+        self._holding_values: Dict[int, Decimal] = {}
+        self._holdings: Dict[int, Dict[int, int]] = {}
+        self._holders: Dict[int, Dict[int, int]] = {}
+        self._prices: Dict[int, Decimal] = {}
+        self._net: Dict[int, Decimal] = {}
+        self._ranking = IndexableSkipList()
+        self._built = False
+        self._rebuilding = False
+        self._pending: List[Tuple[str, tuple]] = []
+        # 재계산 직렬화 - 동시에 두 번 재계산하면 뒤의 재계산이 앞의 재계산 중 쌓인 증분 갱신(_pending)을 비움
+        self._build_lock = asyncio.Lock()
+        self.rebuilds = 0
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    # 내부 갱신 (잠금 보유 상태에서 호출)
+    def _set_net(self, user_id: int):
+        old = self._net.get(user_id)
+        new = self._money.get(user_id, ZERO) + self._holding_values.get(user_id, ZERO)
+        if old == new:
+            return
+        if old is not None:
+            self._ranking.remove((-old, user_id))
+        self._ranking.insert((-new, user_id))
+        self._net[user_id] = new
+
+    def _apply(self, kind: str, args: tuple):
+        getattr(self, f"_apply_{kind}")(*args)
+
+    def _apply_user(self, user_id: int, name: str):
+        self._names[user_id] = name
+        self._set_net(user_id)
+
+    def _apply_remove_user(self, user_id: int):
+        net = self._net.pop(user_id, None)
+        if net is not None:
+            self._ranking.remove((-net, user_id))
+        self._names.pop(user_id, None)
+        self._money.pop(user_id, None)
+        self._holding_values.pop(user_id, None)
+        for j_id in self._holdings.pop(user_id, {}):
+            self._holders.get(j_id, {}).pop(user_id, None)
+
+    def _apply_balance(self, user_id: int, money: Decimal):
+        self._money[user_id] = Decimal(money)
+        self._set_net(user_id)
+
+    def _apply_holding(self, user_id: int, j_id: int, quantity: int):
+        holdings = self._holdings.setdefault(user_id, {})
+        old = holdings.get(j_id, 0)
+        if quantity > 0:
+            holdings[j_id] = quantity
+            self._holders.setdefault(j_id, {})[user_id] = quantity
+        else:
+            holdings.pop(j_id, None)
+            self._holders.get(j_id, {}).pop(user_id, None)
+        price = self._prices.get(j_id, ZERO)
+        self._holding_values[user_id] = self._holding_values.get(user_id, ZERO) + price * (quantity - old)
+        self._set_net(user_id)
+
+    def _apply_prices(self, prices: Mapping[int, Decimal]):
+        for j_id, price in prices.items():
+            price = Decimal(price)
+            old = self._prices.get(j_id, ZERO)
+            self._prices[j_id] = price
+            if price == old:
+                continue
+            for user_id, quantity in self._holders.get(j_id, {}).items():
+                self._holding_values[user_id] = self._holding_values.get(user_id, ZERO) + (price - old) * quantity
+                self._set_net(user_id)
+
+    def _record(self, kind: str, *args):
+        with self._lock:
+            if not self._built and not self._rebuilding:
+                # 아직 로딩 전이면 첫 재계산에서 DB 상태를 그대로 읽음
+                return
+            if self._rebuilding:
+                self._pending.append((kind, args))
+            if self._built:
+                self._apply(kind, args)
+
+    # 증분 갱신 훅 (커밋 후 호출)
+    def add_user(self, user_id: int, name: str):
+        self._record("user", user_id, name)
+
+    def remove_user(self, user_id: int):
+        self._record("remove_user", user_id)
+
+    def set_balance(self, user_id: int, money: Decimal):
+        self._record("balance", user_id, money)
+
+    def set_holding(self, user_id: int, j_id: int, quantity: int, price: Optional[Decimal] = None):
+        if price is not None:
+            self._record("prices", {j_id: price})
+        self._record("holding", user_id, j_id, quantity)
+
+    def set_prices(self, prices: Mapping[int, Decimal]):
+        self._record("prices", dict(prices))
+
+    async def rebuild(self):
+        """DB 전체 조인으로 순위 재계산 - 재계산 중 들어온 증분 갱신은 교체 후 재적용"""
+        async with self._build_lock:
+            await self._rebuild()
+
+    async def _rebuild(self):
+        with self._lock:
+            self._rebuilding = True
+            self._pending = []
+        try:
+            SessionLocal = get_engine().sessionmaker()
+            async with SessionLocal() as db:
+                users = (await db.execute(
+                    select(User.user_id, User.id, UserWallet.money)
+                    .outerjoin(UserWallet, UserWallet.user_id == User.user_id)
+                )).all()
+                prices = (await db.execute(select(Stock.j_id, Stock.price))).all()
+                holdings = (await db.execute(
+                    select(StockOwnership.user_id, StockOwnership.j_id, StockOwnership.quantity)
+                    .where(StockOwnership.quantity > 0)
+                )).all()
+
+            fresh = Leaderboard()
+            fresh._built = True
+            fresh._apply_prices({j_id: price for j_id, price in prices})
+            for user_id, name, money in users:
+                fresh._names[user_id] = name
+                fresh._money[user_id] = Decimal(money or 0)
+            for user_id, j_id, quantity in holdings:
+                fresh._holdings.setdefault(user_id, {})[j_id] = quantity
+                fresh._holders.setdefault(j_id, {})[user_id] = quantity
+                fresh._holding_values[user_id] = (
+                    fresh._holding_values.get(user_id, ZERO) + fresh._prices.get(j_id, ZERO) * quantity
+                )
+            for user_id in fresh._names:
+                fresh._set_net(user_id)
+
+            with self._lock:
+                for kind, args in self._pending:
+                    fresh._apply(kind, args)
+                self._names, self._money = fresh._names, fresh._money
+                self._holding_values, self._holdings = fresh._holding_values, fresh._holdings
+                self._holders, self._prices = fresh._holders, fresh._prices
+                self._net, self._ranking = fresh._net, fresh._ranking
+                self._built = True
+                self.rebuilds += 1
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._pending = []
+
+    async def ensure_built(self):
+        """첫 조회 시 한 번만 재계산 - 동시에 들어온 첫 요청들은 앞선 재계산이 끝나기를 기다림"""
+        if self._built:
+            return
+        async with self._build_lock:
+            if not self._built:
+                await self._rebuild()
+
+    async def run_periodic_rebuild(self, interval: float = LEADERBOARD_REBUILD_SECONDS):
+        """주기적 재계산 루프 (lifespan에서 백그라운드 작업으로 실행)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("리더보드 재계산 실패")
+
+    def _entry(self, rank: int, user_id: int) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            rank=rank,
+            user_id=user_id,
+            id=self._names.get(user_id, ""),
+            net_worth=float(self._net[user_id]),
+        )
+
+    def top(self, limit: int) -> List[LeaderboardEntry]:
+        """순자산 상위 limit명"""
+        with self._lock:
+            return [
+                self._entry(rank, user_id)
+                for rank, (_, user_id) in enumerate(self._ranking.head_items(limit), start=1)
+            ]
+
+    def rank_of(self, user_id: int) -> Optional[LeaderboardEntry]:
+        """사용자의 순위 (1부터 시작)"""
+        with self._lock:
+            net = self._net.get(user_id)
+            if net is None:
+                return None
+            return self._entry(self._ranking.index((-net, user_id)) + 1, user_id)
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def stats(self) -> dict:
+        return {"users": len(self._ranking), "built": self._built, "rebuilds": self.rebuilds}
+
+    def reset(self):
+        """상태 초기화 (애플리케이션 시작 시 호출)"""
+        with self._lock:
+            self._reset_state()
+
+# 애플리케이션 전역 리더보드
+leaderboard = Leaderboard()
@@ -0,0 +1,267 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from config import settings
+
+# 지표 수집 사용 여부 - 끄면 미들웨어와 DB 이벤트 리스너가 아무것도 기록하지 않음
+METRICS_ENABLED = settings.metrics_enabled
+
+# 지연 시간 히스토그램 구간(초) - 밀리초 단위 DB 조회부터 수 초 걸리는 해싱까지
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    """레이블 조합별 값을 보관하는 지표 기본 클래스"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames}가 필요합니다.")
+        return tuple(str(label) for label in labels)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+class Histogram(_Metric):
+    """누적 구간 히스토그램 - 관측마다 이분 탐색 1회와 잠금 1회"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels: str, value: float):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [구간별 개수..., +Inf 개수], 합계
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def sum(self, *labels: str) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    """지표 목록 - Prometheus 텍스트 형식(0.0.4)으로 출력"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def reset(self):
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# HTTP
+http_requests_total = registry.counter("http_requests_total", "처리한 HTTP 요청 수", ("method", "route", "status"))
+http_request_duration_seconds = registry.histogram("http_request_duration_seconds", "HTTP 요청 처리 시간(초)", ("method", "route"))
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수", ("method", "route"))
+# DB
+db_queries_per_request = registry.histogram("http_request_db_queries", "요청당 SQL 실행 횟수", ("route",), COUNT_BUCKETS)
+db_seconds_per_request = registry.histogram("http_request_db_seconds", "요청당 SQL 실행 시간 합계(초)", ("route",))
+db_query_duration_seconds = registry.histogram("db_query_duration_seconds", "SQL 실행 시간(초)")
+db_pool_checkout_wait_seconds = registry.histogram("db_pool_checkout_wait_seconds", "요청 세션의 커넥션 풀 대기 시간(초)")
+db_pool_connections = registry.gauge("db_pool_connections", "커넥션 풀 점유 현황", ("state",))
+# 인증
+password_hash_seconds = registry.histogram("password_hash_seconds", "패스워드 해싱/검증 실행 시간(초, 대기 제외)", ("operation",))
+password_hash_wait_seconds = registry.histogram("password_hash_wait_seconds", "패스워드 해싱 워커 대기 시간(초)")
+jwt_seconds = registry.histogram("jwt_seconds", "JWT 서명/검증 시간(초, 캐시 적중 제외)", ("operation",))
+jwt_verify_cache_total = registry.counter("jwt_verify_cache_total", "JWT 검증 캐시 조회 결과", ("result",))
+
+class RequestStats:
+    """요청 하나에서 실행된 SQL 횟수/시간"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# 현재 요청의 SQL 집계 대상 - SQLAlchemy 이벤트는 요청 태스크의 컨텍스트에서 실행됨
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["metrics_query_start"].pop()
+    elapsed = time.perf_counter() - started
+    db_query_duration_seconds.observe(value=elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+def _handle_error(exception_context):
+    # 실패한 실행은 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_query_start"):
+        conn.info["metrics_query_start"].pop()
+
+def instrument_engine(engine):
+    """엔진에 SQL 실행 시간 측정 이벤트 등록 (AsyncEngine이면 sync_engine에 등록)"""
+    if not METRICS_ENABLED:
+        return
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+def _route_template(scope) -> str:
+    """경로 매개변수가 아닌 라우트 템플릿으로 레이블을 만들어 레이블 수가 요청 경로 수만큼 늘지 않게 함"""
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+class MetricsMiddleware:
+    """요청 수/처리 시간/처리 중 요청 수와 요청당 SQL 집계를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        http_requests_in_flight.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            http_requests_in_flight.dec(method, route)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(method, route, value=elapsed)
+            db_queries_per_request.observe(route, value=stats.queries)
+            db_seconds_per_request.observe(route, value=stats.db_seconds)
+
+def render_metrics(pool_status: Optional[dict] = None) -> str:
+    """수집 시점의 커넥션 풀 현황을 반영해 전체 지표 출력"""
+    for state in ("size", "checkedin", "checkedout", "overflow"):
+        if pool_status and isinstance(pool_status.get(state), int):
+            db_pool_connections.set(state, value=pool_status[state])
+    return registry.render()
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, TEXT, INT, BIGINT, VARCHAR, DECIMAL, ForeignKey
+from sqlalchemy import Column, TEXT, INT, BIGINT, VARCHAR, DECIMAL, DATETIME, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import datetime
 
 Base = declarative_base()
 
+# 금액/가격 컬럼(DECIMAL(15, 2))에 담을 수 있는 절댓값 상한 (미만)
+DECIMAL_15_2_LIMIT = 10 ** 13
+
 # Pydantic 모델들 (API 요청/응답용)
 class UserCreate(BaseModel):
     id: str
@@ -20,9 +24,21 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
     id: Optional[str] = None
+    exp: Optional[int] = None
+
+class CurrentUser(BaseModel):
+    """인증된 사용자 정보 (요청 간 캐시되는 불변 스냅샷)"""
+    user_id: int
+    id: str
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class UserWalletCreate(BaseModel):
     money: float
@@ -33,6 +49,93 @@ class UserWalletResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class WalletAdjustment(BaseModel):
+    """일괄 지갑 조정 항목 (amount > 0 충전, amount < 0 차감)"""
+    user_id: int
+    amount: float = Field(gt=-DECIMAL_15_2_LIMIT, lt=DECIMAL_15_2_LIMIT, allow_inf_nan=False)
+
+class WalletAdjustmentResult(BaseModel):
+    index: int
+    user_id: Optional[int] = None
+    status: str  # applied / unknown_user / insufficient_funds / invalid / failed
+    money: Optional[float] = None
+    detail: Optional[str] = None
+
+class WalletAdjustmentBatchResponse(BaseModel):
+    applied: int
+    rejected: int
+    results: List[WalletAdjustmentResult]
+
+class StockResponse(BaseModel):
+    j_id: int
+    name: str
+    price: float
+    explanation: Optional[str] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class OrderCreate(BaseModel):
+    j_id: int
+    quantity: int = Field(gt=0)
+
+class OrderResponse(BaseModel):
+    j_id: int
+    side: str  # buy / sell
+    quantity: int
+    price: float
+    amount: float
+    money: float
+    holding_quantity: int
+
+class PortfolioHolding(BaseModel):
+    j_id: int
+    name: str
+    quantity: int
+    price_at_time: float
+    price: float
+    cost_basis: float
+    market_value: float
+    unrealized_pnl: float
+
+class PortfolioResponse(BaseModel):
+    user_id: int
+    holdings: List[PortfolioHolding]
+    total_cost_basis: float
+    total_market_value: float
+    total_unrealized_pnl: float
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    id: str
+    net_worth: float
+
+class LeaderboardResponse(BaseModel):
+    total_users: int
+    entries: List[LeaderboardEntry]
+
+class PriceTick(BaseModel):
+    j_id: int
+    price: float = Field(gt=0, lt=DECIMAL_15_2_LIMIT, allow_inf_nan=False)
+
+class PriceIngestResponse(BaseModel):
+    accepted: int
+    rejected: int
+    pending: int
+
+class WalletLedgerEntry(BaseModel):
+    id: int
+    amount: Optional[float] = None  # 잔액 설정(set)은 변동액 없이 설정 후 잔액만 기록
+    balance_after: float
+    kind: str
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class WalletHistoryResponse(BaseModel):
+    entries: List[WalletLedgerEntry]
+    next_cursor: Optional[int] = None
+
 # SQLAlchemy 모델들
 class User(Base):
     __tablename__ = "user"
@@ -75,4 +178,42 @@ class StockOwnership(Base):
     
     # 관계 설정
     user = relationship("User", back_populates="stock_ownerships")
-    stock = relationship("Stock", back_populates="ownerships")
\ No newline at end of file
+    stock = relationship("Stock", back_populates="ownerships")
+
+class WalletLedger(Base):
+    """지갑 거래 원장 (추가 전용) - 잔액 변경과 같은 트랜잭션에서 기록"""
+    __tablename__ = "wallet_ledger"
+    
+    # SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 SQLite에서는 INT 사용
+    id = Column(BIGINT().with_variant(INT(), "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(INT, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False)
+    amount = Column(DECIMAL(15, 2), nullable=True)  # 변동액 (차감은 음수, 잔액 설정(set)은 NULL)
+    balance_after = Column(DECIMAL(15, 2), nullable=False)
+    kind = Column(VARCHAR(20), nullable=False)  # credit / set / adjustment / buy / sell
+    created_at = Column(DATETIME, nullable=False, server_default=func.now())
+    
+    # 사용자별 키셋 페이지네이션 (WHERE user_id = ? AND id < ? ORDER BY id DESC)
+    __table_args__ = (
+        Index("ix_wallet_ledger_user_id_id", "user_id", "id"),
+    )
+
+class IdempotencyRecord(Base):
+    """Idempotency-Key로 처리된 변경 요청의 응답 (여러 워커 간 중복 제거용)"""
+    __tablename__ = "idempotency_key"
+    
+    user_id = Column(INT, ForeignKey("user.user_id", ondelete="CASCADE"), primary_key=True)
+    key = Column(VARCHAR(255), primary_key=True)
+    fingerprint = Column(VARCHAR(64), nullable=False)  # 요청 내용 해시
+    response_body = Column(TEXT, nullable=False)
+    expires_at = Column(DATETIME, nullable=False, index=True)
+
+class RefreshToken(Base):
+    """리프레시 토큰 (원문은 저장하지 않고 SHA-256 해시만 보관)"""
+    __tablename__ = "refresh_token"
+    
+    id = Column(BIGINT().with_variant(INT(), "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(INT, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(VARCHAR(64), nullable=False, unique=True)
+    family_id = Column(VARCHAR(32), nullable=False, index=True)  # 같은 로그인에서 회전된 토큰 묶음
+    expires_at = Column(DATETIME, nullable=False)
+    revoked_at = Column(DATETIME, nullable=True)  # 회전/폐기 시각 (NULL이면 사용 가능)
@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import PortfolioHolding, PortfolioResponse, Stock, StockOwnership
+
+async def get_portfolio(db: AsyncSession, user_id: int) -> PortfolioResponse:
+    """보유 주식 평가 - 보유 수량/매입 원가/평가 금액을 하나의 조인 쿼리로 계산
+
+    relationship 지연 로딩을 사용하면 보유 종목마다 Stock 조회가 발생(N+1)하므로 사용하지 않음
+    """
+    cost_basis = (StockOwnership.quantity * StockOwnership.price_at_time).label("cost_basis")
+    market_value = (StockOwnership.quantity * Stock.price).label("market_value")
+    result = await db.execute(
+        select(
+            StockOwnership.j_id,
+            Stock.name,
+            StockOwnership.quantity,
+            StockOwnership.price_at_time,
+            Stock.price,
+            cost_basis,
+            market_value,
+        )
+        .join(Stock, Stock.j_id == StockOwnership.j_id)
+        .where(StockOwnership.user_id == user_id, StockOwnership.quantity > 0)
+        .order_by(StockOwnership.j_id)
+    )
+
+    holdings = []
+    total_cost = Decimal("0")
+    total_value = Decimal("0")
+    for row in result:
+        cost = Decimal(row.cost_basis)
+        value = Decimal(row.market_value)
+        total_cost += cost
+        total_value += value
+        holdings.append(PortfolioHolding(
+            j_id=row.j_id,
+            name=row.name,
+            quantity=row.quantity,
+            price_at_time=float(row.price_at_time),
+            price=float(row.price),
+            cost_basis=float(cost),
+            market_value=float(value),
+            unrealized_pnl=float(value - cost),
+        ))
+
+    return PortfolioResponse(
+        user_id=user_id,
+        holdings=holdings,
+        total_cost_basis=float(total_cost),
+        total_market_value=float(total_value),
+        total_unrealized_pnl=float(total_value - total_cost),
+    )
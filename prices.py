@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Mapping
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import DataError
+
+from config import settings
+from database import get_engine
+from models import DECIMAL_15_2_LIMIT, Stock
+
+logger = logging.getLogger(__name__)
+
+# 가격 틱을 모아 DB에 반영하는 주기(초) - 주기 안에서는 종목별 마지막 가격만 기록
+PRICE_FLUSH_INTERVAL = settings.price_flush_interval
+
+class PriceIngestor:
+    """시세 틱을 종목별로 병합하여 주기마다 일괄 UPDATE하고 구독자에게 변경 가격을 알림"""
+
+    def __init__(self, flush_interval: float = PRICE_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, Decimal] = {}
+        self._listeners: List[Callable[[Mapping[int, Decimal]], None]] = []
+        self.ticks = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.dropped = 0
+        self.last_flush_seconds = 0.0
+
+    def subscribe(self, listener: Callable[[Mapping[int, Decimal]], None]):
+        """반영된 가격 묶음({j_id: price})을 받을 구독자 등록"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def submit(self, j_id: int, price: Decimal):
+        """가격 틱 접수 - 같은 주기 안의 이전 틱은 덮어씀"""
+        self._pending[j_id] = price
+        self.ticks += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _drop(self, j_id: int, price: Decimal, reason: str):
+        self.dropped += 1
+        logger.warning("가격 틱 폐기 (j_id=%s, price=%s): %s", j_id, price, reason)
+
+    async def flush(self) -> Dict[int, Decimal]:
+        """병합된 가격을 executemany UPDATE 한 번으로 반영
+
+        재시도해도 실패할 행(컬럼 범위 밖의 값 등)은 묶음 전체를 매 주기 막지 않도록 버림
+        """
+        if not self._pending:
+            return {}
+        batch, self._pending = self._pending, {}
+        for j_id, price in list(batch.items()):
+            if not (price.is_finite() and 0 < price < DECIMAL_15_2_LIMIT):
+                del batch[j_id]
+                self._drop(j_id, price, "가격 범위를 벗어남")
+        if not batch:
+            return {}
+        started = time.perf_counter()
+        stock = Stock.__table__
+        stmt = (
+            update(stock)
+            .where(stock.c.j_id == bindparam("b_j_id"))
+            .values(price=bindparam("b_price"))
+        )
+        try:
+            async with get_engine().connection() as conn:
+                try:
+                    await conn.execute(stmt, [{"b_j_id": j_id, "b_price": price} for j_id, price in batch.items()])
+                    await conn.commit()
+                except DataError:
+                    # 값 오류는 한 행만으로도 묶음 전체가 실패하므로 행 단위로 다시 반영하고 실패한 행만 버림
+                    await conn.rollback()
+                    for j_id, price in list(batch.items()):
+                        try:
+                            await conn.execute(stmt, [{"b_j_id": j_id, "b_price": price}])
+                            await conn.commit()
+                        except DataError as e:
+                            await conn.rollback()
+                            del batch[j_id]
+                            self._drop(j_id, price, str(e.orig))
+        except BaseException:
+            # 실패하거나 반영 중 취소된(CancelledError) 묶음은 그 사이 들어온 새 틱을 덮어쓰지 않도록 병합 후 다음 주기에 재시도
+            self._pending = {**batch, **self._pending}
+            raise
+        self.flushes += 1
+        self.rows_written += len(batch)
+        self.last_flush_seconds = time.perf_counter() - started
+        for listener in self._listeners:
+            try:
+                listener(batch)
+            except Exception:
+                logger.exception("가격 변경 구독자 처리 실패")
+        return batch
+
+    async def run(self):
+        """주기적 반영 루프 (lifespan에서 백그라운드 작업으로 실행)"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("가격 일괄 반영 실패")
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "dropped": self.dropped,
+            "flush_interval_seconds": self.flush_interval,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+        }
+
+# 애플리케이션 전역 시세 수집기
+price_ingestor = PriceIngestor()
@@ -0,0 +1,232 @@
+import contextvars
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# SQL 프로파일링 모드
+# - off: 사용 안 함 (기본값)
+# - header: X-SQL-Profile: 1 헤더와 유효한 X-Admin-Key가 함께 있는 요청만 프로파일링 (운영 환경 디버깅용)
+# - all: 모든 요청 프로파일링 (개발용)
+SQL_PROFILE_MODE = settings.sql_profile_mode
+# 같은 모양의 문장이 요청 하나에서 이 횟수 이상 실행되면 N+1로 표시
+SQL_PROFILE_REPEAT_THRESHOLD = settings.sql_profile_repeat_threshold
+SQL_PROFILE_SLOW_MS = settings.sql_profile_slow_ms
+SQL_PROFILE_TOP = settings.sql_profile_top
+SQL_PROFILE_HISTORY = settings.sql_profile_history
+SQL_PROFILE_HEADER = "x-sql-profile"
+ADMIN_KEY_HEADER = "x-admin-key"
+
+_WHITESPACE = re.compile(r"\s+")
+# IN (?, ?, ?) 처럼 값 개수에 따라 길이가 달라지는 자리표시자 목록을 하나로 접음
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+
+def statement_shape(statement: str) -> str:
+    """SQL 문장 모양 - 공백과 자리표시자 목록 길이 차이를 정규화 (값은 이미 바인딩 매개변수로 분리됨)"""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """매개변수 모양 - 값은 기록하지 않고 이름/개수와 타입만 남김"""
+    if executemany:
+        rows = list(parameters or ())
+        return f"executemany x{len(rows)} of {parameters_shape(rows[0], False) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in sorted(parameters.items())) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+class QueryProfile:
+    """요청(또는 작업) 하나에서 실행된 SQL 문장 기록"""
+
+    def __init__(self, label: str):
+        self.id = secrets.token_hex(6)
+        self.label = label
+        self.started_at = time.time()
+        self.statements: List[tuple] = []  # (문장 모양, 매개변수 모양, 소요 초, executemany 여부)
+
+    def record(self, statement: str, parameters, seconds: float, executemany: bool):
+        self.statements.append((statement, parameters, seconds, executemany))
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, _, seconds, _ in self.statements)
+
+    def summary(
+        self,
+        repeat_threshold: int = SQL_PROFILE_REPEAT_THRESHOLD,
+        slow_ms: float = SQL_PROFILE_SLOW_MS,
+        top: int = SQL_PROFILE_TOP,
+    ) -> dict:
+        """문장 수, 반복 실행된 문장(N+1 의심), 가장 느린 문장 요약"""
+        groups: Dict[str, list] = {}
+        for statement, _, seconds, executemany in self.statements:
+            if executemany:
+                continue
+            group = groups.setdefault(statement, [0, 0.0])
+            group[0] += 1
+            group[1] += seconds
+        repeated = sorted(
+            (
+                {"statement": statement, "count": count, "total_ms": round(total * 1000, 3)}
+                for statement, (count, total) in groups.items() if count >= repeat_threshold
+            ),
+            key=lambda item: -item["count"],
+        )
+        slowest = sorted(self.statements, key=lambda item: -item[2])[:top]
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "statements": len(self.statements),
+            "distinct_statements": len({statement for statement, _, _, _ in self.statements}),
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "n_plus_one": repeated,
+            "slow": sum(1 for _, _, seconds, _ in self.statements if seconds * 1000 >= slow_ms),
+            "slowest": [
+                {"statement": statement, "parameters": parameters, "ms": round(seconds * 1000, 3)}
+                for statement, parameters, seconds, _ in slowest
+            ],
+        }
+
+# 현재 프로파일링 대상 - None이면 이벤트 리스너가 바로 반환
+current_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar("current_profile", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is None or not conn.info.get("profile_query_start"):
+        return
+    elapsed = time.perf_counter() - conn.info["profile_query_start"].pop()
+    profile.record(statement_shape(statement), parameters_shape(parameters, executemany), elapsed, executemany)
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profile_query_start"):
+        conn.info["profile_query_start"].pop()
+
+def attach_profiler(engine):
+    """엔진에 SQL 프로파일링 이벤트 등록 - 프로파일링 중이 아닐 때는 컨텍스트 변수 조회 1회만 수행"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+class SQLProfiler:
+    """프로파일 결과 보관 및 기록 - 최근 결과는 관리자 API로 조회"""
+
+    def __init__(self, mode: str = SQL_PROFILE_MODE, history: int = SQL_PROFILE_HISTORY):
+        if mode not in ("off", "header", "all"):
+            raise ValueError(f"알 수 없는 SQL_PROFILE_MODE입니다: {mode} (off, header, all)")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=history)
+        self.profiled = 0
+        self.flagged = 0
+
+    def wants(self, header_value: Optional[str], admin_key: Optional[str] = None) -> bool:
+        """요청을 프로파일링할지 여부 - header 모드는 관리자 API 키가 맞는 요청만 (익명 요청의 기록/로그 유발 방지)"""
+        if self.mode == "all":
+            return True
+        if self.mode != "header" or header_value not in ("1", "true", "on"):
+            return False
+        from auth import is_admin_key  # auth -> database -> profiler 순환 import 방지
+
+        return is_admin_key(admin_key)
+
+    @contextmanager
+    def profile(self, label: str):
+        """with 블록 안에서 실행된 SQL을 프로파일링하고 끝나면 결과 기록"""
+        profile = QueryProfile(label)
+        token = current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            current_profile.reset(token)
+            self.finish(profile)
+
+    def finish(self, profile: QueryProfile) -> dict:
+        summary = profile.summary()
+        flagged = bool(summary["n_plus_one"]) or summary["slow"] > 0
+        with self._lock:
+            self._recent.append(summary)
+            self.profiled += 1
+            self.flagged += flagged
+        if flagged:
+            logger.warning(
+                "SQL 프로파일 %s %s: 문장 %d개 %.1fms, N+1 의심 %s, 느린 문장 %d개",
+                summary["id"], summary["label"], summary["statements"], summary["total_ms"],
+                [(item["count"], item["statement"]) for item in summary["n_plus_one"]], summary["slow"],
+            )
+        else:
+            logger.info(
+                "SQL 프로파일 %s %s: 문장 %d개 %.1fms",
+                summary["id"], summary["label"], summary["statements"], summary["total_ms"],
+            )
+        return summary
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        """최근 프로파일 결과 (최신순)"""
+        with self._lock:
+            return list(self._recent)[-limit:][::-1]
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self.profiled = 0
+            self.flagged = 0
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "profiled": self.profiled, "flagged": self.flagged, "kept": len(self._recent)}
+
+class SQLProfileMiddleware:
+    """요청 단위 SQL 프로파일링 ASGI 미들웨어 - 응답 헤더에 요약을 싣고 상세 결과는 기록/보관"""
+
+    def __init__(self, app, profiler: Optional[SQLProfiler] = None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler or sql_profiler
+        if scope["type"] != "http" or profiler.mode == "off":
+            await self.app(scope, receive, send)
+            return
+        header_value = admin_key = None
+        for name, value in scope.get("headers", []):
+            if name == SQL_PROFILE_HEADER.encode():
+                header_value = value.decode("latin-1").strip().lower()
+            elif name == ADMIN_KEY_HEADER.encode():
+                admin_key = value.decode("latin-1")
+        if not profiler.wants(header_value, admin_key):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # 응답 시작 전까지 실행된 문장 기준 (스트리밍 응답 이후 문장은 기록에만 포함)
+                summary = profile.summary()
+                value = (
+                    f"id={profile.id}; statements={summary['statements']}; "
+                    f"n_plus_one={len(summary['n_plus_one'])}; total_ms={summary['total_ms']}"
+                )
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-sql-profile", value.encode())]}
+            await send(message)
+
+        with profiler.profile(f"{scope['method']} {scope['path']}") as profile:
+            await self.app(scope, receive, send_wrapper)
+
+# 애플리케이션 전역 SQL 프로파일러
+sql_profiler = SQLProfiler()
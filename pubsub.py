@@ -0,0 +1,130 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+from config import settings
+
+# 연결별 전송 대기열 크기 - 가득 차면 느린 소비자로 보고 연결을 끊음
+PUBSUB_QUEUE_SIZE = settings.pubsub_queue_size
+# 유휴 연결 유지를 위한 SSE 주석 전송 주기(초)
+SSE_KEEPALIVE_SECONDS = settings.sse_keepalive_seconds
+
+def wallet_topic(user_id: int) -> str:
+    return f"wallet:{user_id}"
+
+def price_topic(j_id: int) -> str:
+    return f"price:{j_id}"
+
+class Subscription:
+    """구독 하나(연결 하나)의 전송 대기열"""
+
+    __slots__ = ("topics", "queue", "dropped")
+
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    async def get(self) -> Optional[dict]:
+        """다음 메시지 - 느린 소비자로 끊긴 경우 None"""
+        return await self.queue.get()
+
+class PubSubHub:
+    """프로세스 내 토픽 기반 발행/구독 허브
+
+    이벤트 루프 스레드에서만 사용하며, 발행은 대기 없이 각 구독 대기열에 넣고
+    대기열이 가득 찬 구독은 즉시 해제하여 느린 소비자가 발행자를 막지 않도록 함
+    """
+
+    def __init__(self, queue_size: int = PUBSUB_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.queue_size)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def _drop(self, subscription: Subscription):
+        """느린 소비자 해제 - 쌓인 메시지를 비우고 종료 신호(None) 전달"""
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        self.dropped += 1
+
+    def publish(self, topic: str, message: dict) -> int:
+        """토픽 구독자들에게 메시지 전달 - 전달한 구독 수 반환"""
+        self.published += 1
+        subscribers = self._topics.get(topic)
+        if not subscribers:
+            return 0
+        delivered = 0
+        for subscription in list(subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        self.delivered += delivered
+        return delivered
+
+    @property
+    def subscriptions(self) -> int:
+        return len({subscription for subscribers in self._topics.values() for subscription in subscribers})
+
+    def stats(self) -> dict:
+        return {
+            "topics": len(self._topics),
+            "subscriptions": self.subscriptions,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_slow_consumers": self.dropped,
+            "queue_size": self.queue_size,
+        }
+
+async def sse_events(
+    hub: PubSubHub,
+    topics: Iterable[str],
+    keepalive: float = SSE_KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """토픽을 구독해 메시지를 Server-Sent Events 형식으로 변환 - 연결 종료 시 구독 해제"""
+    # 제너레이터 안에서 구독 - 첫 반복 전에 연결이 끊겨도(finally 미실행) 구독이 남지 않음
+    subscription = hub.subscribe(topics)
+    # asyncio.wait_for는 완료와 취소가 겹치면 취소를 삼킬 수 있어(3.11 이하) 대기 작업을 직접 관리
+    getter = None
+    try:
+        yield ": connected\n\n"
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({getter}, timeout=keepalive)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+            message = getter.result()
+            getter = None
+            if message is None:
+                yield "event: dropped\ndata: {}\n\n"
+                break
+            yield f"event: {message['type']}\ndata: {json.dumps(message, ensure_ascii=False)}\n\n"
+    finally:
+        if getter is not None:
+            getter.cancel()
+        hub.unsubscribe(subscription)
+
+# 애플리케이션 전역 발행/구독 허브
+hub = PubSubHub()
@@ -0,0 +1,235 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import parse_qs
+
+from config import settings
+
+# 로그인/회원가입 요청 제한 - "허용 횟수/초" 형식 (예: 30/60은 60초에 30회, 순간 최대 30회)
+RATE_LIMIT_ENABLED = settings.rate_limit_enabled
+RATE_LIMIT_LOGIN_IP = settings.rate_limit_login_ip
+RATE_LIMIT_LOGIN_USER = settings.rate_limit_login_user
+RATE_LIMIT_REGISTER_IP = settings.rate_limit_register_ip
+RATE_LIMIT_REGISTER_USER = settings.rate_limit_register_user
+# 프록시 뒤에서 실행할 때만 X-Forwarded-For의 첫 주소를 클라이언트 IP로 사용
+RATE_LIMIT_TRUST_FORWARDED = settings.rate_limit_trust_forwarded
+RATE_LIMIT_SHARDS = settings.rate_limit_shards
+RATE_LIMIT_MAX_KEYS = settings.rate_limit_max_keys
+# 사용자 ID 추출을 위해 읽는 요청 본문 최대 크기 (초과하면 IP 제한만 적용)
+RATE_LIMIT_MAX_BODY = 16 * 1024
+
+class Limit:
+    """토큰 버킷 설정 - capacity개까지 쌓이고 초당 rate개씩 채워짐"""
+
+    def __init__(self, capacity: float, per_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        count, _, seconds = spec.partition("/")
+        return cls(float(count), float(seconds or 1))
+
+class RateLimitBackend(Protocol):
+    """버킷 상태 저장소 인터페이스 - 여러 워커가 한도를 공유하려면 Redis 등으로 구현"""
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        """토큰을 꺼내고 (허용 여부, 거부 시 재시도까지 남은 초) 반환"""
+        ...
+
+    def stats(self) -> dict:
+        ...
+
+class InMemoryBucketStore:
+    """프로세스 로컬 토큰 버킷 저장소 - 키 해시로 샤드를 나눠 샤드별 잠금으로 경합을 줄임
+
+    오래 쓰이지 않아 다시 가득 찬 버킷은 접근 시점에 샤드 단위로 정리하고,
+    샤드별 최대 키 수를 넘으면 가장 오래 쓰이지 않은 버킷부터 제거
+    """
+
+    def __init__(
+        self,
+        shards: int = RATE_LIMIT_SHARDS,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._max_per_shard = max(1, max_keys // shards)
+        self._shards: List["OrderedDict[str, Tuple[float, float, float]]"] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.evictions = 0
+
+    def _sweep(self, shard: "OrderedDict[str, Tuple[float, float, float]]", now: float):
+        # 가장 오래 쓰이지 않은 버킷부터 만료 여부 확인
+        while shard:
+            key, (_, _, expires_at) = next(iter(shard.items()))
+            if expires_at > now and len(shard) <= self._max_per_shard:
+                break
+            del shard[key]
+            self.evictions += 1
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            now = self._clock()
+            tokens, updated_at, _ = shard.get(key, (limit.capacity, now, 0.0))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # (남은 토큰, 갱신 시각, 다시 가득 차는 시각) - 가득 찬 버킷은 새 버킷과 같으므로 제거 가능
+            shard[key] = (tokens, now, now + (limit.capacity - tokens) / limit.rate)
+            shard.move_to_end(key)
+            self._sweep(shard, now)
+        return allowed, 0.0 if allowed else (cost - tokens) / limit.rate
+
+    def clear(self):
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                shard.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "keys": sum(len(shard) for shard in self._shards),
+            "shards": len(self._shards),
+            "evictions": self.evictions,
+        }
+
+def _client_ip(scope: dict) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+def _username(path: str, content_type: str, body: bytes) -> Optional[str]:
+    """로그인(form의 username)/회원가입(JSON의 id) 요청에서 사용자 ID 추출 - 형식이 다르면 None"""
+    try:
+        if path == "/token" and content_type.startswith("application/x-www-form-urlencoded"):
+            values = parse_qs(body.decode(), max_num_fields=20).get("username")
+            return values[0] if values else None
+        if path == "/register" and content_type.startswith("application/json"):
+            data = json.loads(body)
+            value = data.get("id") if isinstance(data, dict) else None
+            return value if isinstance(value, str) else None
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return None
+
+class RateLimiter:
+    """경로별 IP/사용자 ID 버킷 검사 - 모든 버킷을 통과해야 허용"""
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.enabled = enabled
+        # (메서드, 경로) -> [(버킷 종류, 제한)]
+        self.rules: Dict[Tuple[str, str], List[Tuple[str, Limit]]] = {
+            ("POST", "/token"): [("ip", Limit.parse(RATE_LIMIT_LOGIN_IP)), ("user", Limit.parse(RATE_LIMIT_LOGIN_USER))],
+            ("POST", "/register"): [
+                ("ip", Limit.parse(RATE_LIMIT_REGISTER_IP)), ("user", Limit.parse(RATE_LIMIT_REGISTER_USER)),
+            ],
+        }
+        self.reset()
+
+    def reset(self):
+        self.allowed = 0
+        self.rejected = {"ip": 0, "user": 0}
+
+    def needs_body(self, method: str, path: str) -> bool:
+        return any(kind == "user" for kind, _ in self.rules.get((method, path), []))
+
+    async def check(self, scope: dict, body: bytes = b"") -> Optional[float]:
+        """허용이면 None, 거부면 재시도까지 남은 초"""
+        method, path = scope["method"], scope["path"]
+        rules = self.rules.get((method, path))
+        if not self.enabled or not rules:
+            return None
+        content_type = ""
+        for name, value in scope.get("headers", []):
+            if name == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        for kind, limit in rules:
+            if kind == "ip":
+                subject = _client_ip(scope)
+            else:
+                subject = _username(path, content_type, body)
+                if subject is None:
+                    continue
+                # 대소문자만 바꾼 ID로 한도를 우회하지 못하도록 정규화
+                subject = subject.strip().lower()
+            allowed, retry_after = await self.backend.take(f"{path}:{kind}:{subject}", limit)
+            if not allowed:
+                self.rejected[kind] += 1
+                return retry_after
+        self.allowed += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "store": self.backend.stats(),
+        }
+
+class RateLimitMiddleware:
+    """요청 제한 ASGI 미들웨어 - 라우팅/의존성(DB 세션, 해싱) 이전에 429로 거절"""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiter or rate_limiter
+        if scope["type"] != "http" or not limiter.enabled or (scope["method"], scope["path"]) not in limiter.rules:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        messages = []
+        if limiter.needs_body(scope["method"], scope["path"]):
+            # 사용자 ID를 읽기 위해 본문을 미리 받아 두고 앱에는 그대로 다시 전달
+            more_body = True
+            while more_body:
+                message = await receive()
+                messages.append(message)
+                if message["type"] != "http.request":
+                    break
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if len(body) > RATE_LIMIT_MAX_BODY:
+                    break
+
+        retry_after = await limiter.check(scope, body if len(body) <= RATE_LIMIT_MAX_BODY else b"")
+        if retry_after is not None:
+            await self._reject(send, retry_after)
+            return
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    async def _reject(self, send, retry_after: float):
+        body = json.dumps({"detail": "요청이 너무 많습니다. 잠시 후 다시 시도하세요."}, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+# 애플리케이션 전역 요청 제한기 (다른 저장소를 쓰려면 backend 교체)
+rate_limiter = RateLimiter(InMemoryBucketStore())
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import RefreshToken, User
+
+logger = logging.getLogger(__name__)
+
+# 리프레시 토큰 유효 기간 - 회전할 때마다 새 토큰이 같은 기간으로 발급됨
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+# 회전 직후 이 시간(초) 안에 같은 토큰이 다시 오면 재사용이 아닌 동시 갱신/재시도로 보고 family를 폐기하지 않음
+REFRESH_TOKEN_REUSE_GRACE_SECONDS = settings.refresh_token_reuse_grace_seconds
+
+# 리프레시 토큰 처리 규칙
+# - 원문은 클라이언트에만 있고 DB에는 SHA-256 해시(unique 인덱스)만 저장하므로 조회는 인덱스 1회
+# - 갱신할 때마다 기존 토큰을 폐기하고 같은 family의 새 토큰을 발급 (회전)
+# - 이미 회전된 토큰이 다시 쓰이면 탈취로 보고 family 전체를 폐기 (회전 직후 유예 시간 안의 재시도는 401만 반환)
+# - 커밋은 호출자가 수행
+
+def hash_refresh_token(token: str) -> str:
+    """리프레시 토큰 저장/조회용 해시 (고엔트로피 임의값이므로 솔트/느린 해시 불필요)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="유효하지 않은 리프레시 토큰입니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def issue_refresh_token(db: AsyncSession, user_id: int, family_id: Optional[str] = None) -> str:
+    """새 리프레시 토큰 발급 - family_id가 없으면 새 로그인 묶음 시작"""
+    token = secrets.token_urlsafe(32)
+    await db.execute(insert(RefreshToken).values(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+async def _revoke_family(db: AsyncSession, family_id: str, now: datetime):
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[str, str]:
+    """리프레시 토큰 회전 - (사용자 ID, 새 리프레시 토큰) 반환, 패스워드 해싱 없음
+
+    재사용이 감지되면 family 전체를 폐기하고 커밋한 뒤 401
+    동시 갱신에서 진 요청이나 타임아웃 후 재시도처럼 폐기 직후의 재사용은 이긴 요청의 새 토큰을 살려 두고 401만 반환
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(RefreshToken.id, RefreshToken.user_id, RefreshToken.family_id,
+               RefreshToken.expires_at, RefreshToken.revoked_at, User.id.label("sub"))
+        .join(User, User.user_id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    row = result.first()
+    if row is None or row.expires_at <= now:
+        raise _invalid_refresh_token()
+
+    # 폐기되지 않은 경우에만 폐기하는 조건부 UPDATE - 동시에 같은 토큰으로 갱신하면 한 요청만 성공
+    claimed = False
+    if row.revoked_at is None:
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        claimed = result.rowcount == 1
+    if not claimed:
+        revoked_at = row.revoked_at or now  # 조회 시 유효했다면 방금 다른 요청이 회전한 것
+        if (now - revoked_at).total_seconds() < REFRESH_TOKEN_REUSE_GRACE_SECONDS:
+            raise _invalid_refresh_token()
+        logger.warning("리프레시 토큰 재사용 감지 - family 폐기 (user_id=%s)", row.user_id)
+        await _revoke_family(db, row.family_id, now)
+        await db.commit()
+        raise _invalid_refresh_token()
+
+    new_token = await issue_refresh_token(db, row.user_id, row.family_id)
+    return row.sub, new_token
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> bool:
+    """리프레시 토큰이 속한 family 전체 폐기 (로그아웃) - 알 수 없는 토큰이면 False"""
+    result = await db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    family_id = result.scalar_one_or_none()
+    if family_id is None:
+        return False
+    await _revoke_family(db, family_id, datetime.utcnow())
+    return True
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: int) -> int:
+    """사용자의 모든 리프레시 토큰 폐기 (모든 기기 로그아웃)"""
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount
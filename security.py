@@ -1,25 +1,92 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from cache import TTLCache
+from config import settings
+from hashing import hash_executor
+from jwt_keys import KeyRing
+from metrics import jwt_seconds, jwt_verify_cache_total
+from models import TokenData
 
 # JWT 설정
-SECRET_KEY = "your-secret-key-here-change-in-production"  # 프로덕션에서는 환경변수로 관리
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = settings.jwt_secret_key.get_secret_value()  # 프로덕션에서는 JWT_SECRET_KEY로 지정 (APP_ENV=production이면 필수)
+# RS256이면 JWT_KEYS_DIR의 개인 키로 서명하고 공개 키를 JWKS로 공개하여 다른 서비스가 직접 검증
+ALGORITHM = settings.jwt_algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+
+# 서명 키 묶음 (kid -> 파싱된 키)
+jwt_keyring = KeyRing(ALGORITHM, secret=SECRET_KEY)
+
+# 검증된 토큰 캐시 (토큰 SHA-256 다이제스트 -> 클레임), 실패한 검증 결과는 캐시하지 않음
+TOKEN_CACHE_SIZE = settings.token_cache_size
+TOKEN_CACHE_TTL = settings.token_cache_ttl
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
+# 패스워드 해싱 설정 - 기본 방식 이외의 해시는 검증만 하고 로그인 시 기본 방식으로 재해싱
+# argon2를 사용하려면 argon2-cffi 패키지가 필요 (pip install argon2-cffi)
+PASSWORD_HASH_SCHEME = settings.password_hash_scheme
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+ARGON2_TIME_COST = settings.argon2_time_cost
+ARGON2_MEMORY_COST = settings.argon2_memory_cost  # KiB
+ARGON2_PARALLELISM = settings.argon2_parallelism
+
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+
+def build_pwd_context(
+    scheme: str = PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = BCRYPT_ROUNDS,
+    argon2_time_cost: int = ARGON2_TIME_COST,
+    argon2_memory_cost: int = ARGON2_MEMORY_COST,
+    argon2_parallelism: int = ARGON2_PARALLELISM,
+) -> CryptContext:
+    """패스워드 해싱 컨텍스트 생성 - 방식이 다르거나 비용 설정이 바뀐 해시는 needs_update 대상"""
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"지원하지 않는 패스워드 해싱 방식입니다: {scheme} (bcrypt 또는 argon2)")
+    schemes = [scheme]
+    if scheme == "argon2":
+        try:
+            import argon2  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("PASSWORD_HASH_SCHEME=argon2를 사용하려면 argon2-cffi 패키지를 설치해야 합니다.") from e
+        # 기존 bcrypt 해시도 검증할 수 있도록 유지
+        schemes.append("bcrypt")
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
 
 # 패스워드 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_pwd_context()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """패스워드 검증"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """패스워드 검증 - 검증에 성공했고 해시가 현재 설정과 다르면 새 해시도 함께 반환"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """패스워드 해싱"""
     return pwd_context.hash(password)
 
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """패스워드 검증 및 재해싱 - 해싱 워커 풀에서 실행"""
+    return await hash_executor.run(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """패스워드 해싱 - 해싱 워커 풀에서 실행"""
+    return await hash_executor.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT 액세스 토큰 생성"""
     to_encode = data.copy()
@@ -29,16 +96,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=15)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    started = time.perf_counter()
+    encoded_jwt = jwt_keyring.sign(to_encode)
+    jwt_seconds.observe("sign", value=time.perf_counter() - started)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """JWT 토큰 검증 및 사용자 ID 반환"""
+def decode_access_token(token: str, use_cache: bool = True) -> Optional[TokenData]:
+    """JWT 토큰 검증 및 클레임(sub, exp) 반환 - 검증된 토큰은 만료 전까지 캐시"""
+    digest = hashlib.sha256(token.encode()).digest()
+    if use_cache:
+        cached = token_cache.get(digest)
+        if cached is not None:
+            # jose와 동일하게 초 단위로 exp를 비교하여 만료된 토큰은 캐시에서 제거 후 재검증
+            if cached.exp is None or cached.exp >= int(time.time()):
+                jwt_verify_cache_total.inc("hit")
+                return cached
+            token_cache.invalidate(digest)
+        jwt_verify_cache_total.inc("miss")
+    started = time.perf_counter()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # kid 헤더로 파싱해 둔 검증 키를 선택 (서명은 검증 전이므로 헤더는 키 선택에만 사용)
+        key = jwt_keyring.verification_key(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            return None
+        payload = jwt.decode(token, key.verify_key, algorithms=[key.algorithm])
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
-        return user_id
+        token_data = TokenData(id=user_id, exp=payload.get("exp"))
     except JWTError:
         return None
+    finally:
+        jwt_seconds.observe("verify", value=time.perf_counter() - started)
+    if use_cache:
+        ttl = token_data.exp - time.time() if token_data.exp is not None else None
+        token_cache.set(digest, token_data, ttl=ttl)
+    return token_data
+
+def verify_token(token: str) -> Optional[str]:
+    """JWT 토큰 검증 및 사용자 ID 반환"""
+    token_data = decode_access_token(token)
+    if token_data is None:
+        return None
+    return token_data.id
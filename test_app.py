@@ -0,0 +1,31 @@
+from conftest import register_and_login
+
+def test_register_login_and_wallet_flow(client):
+    """회원가입 -> 로그인 -> 지갑 생성/조회/충전 흐름"""
+    response = client.post("/register", json={"id": "flowuser", "password": "flowpass"})
+    assert response.status_code == 201
+    assert client.post("/register", json={"id": "flowuser", "password": "flowpass"}).status_code == 400
+
+    headers = register_and_login(client, "flowuser", "flowpass")
+    me = client.get("/users/me", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["id"] == "flowuser"
+
+    response = client.post("/users/me/wallet", json={"money": 1000}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["money"] == 1000
+
+    response = client.put("/users/me/wallet/add?amount=500", headers=headers)
+    assert response.json()["money"] == 1500
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 1500
+
+def test_login_rejects_wrong_password(client):
+    """잘못된 패스워드 로그인 거부"""
+    client.post("/register", json={"id": "wrongpass", "password": "rightpass"})
+    response = client.post("/token", data={"username": "wrongpass", "password": "nope"})
+    assert response.status_code == 401
+
+def test_protected_routes_require_token(client):
+    """토큰 없이 보호된 라우트 접근 거부"""
+    assert client.get("/users/me").status_code == 401
+    assert client.get("/protected", headers={"Authorization": "Bearer invalid"}).status_code == 401
@@ -0,0 +1,105 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from auth import principal_cache, delete_user
+from conftest import ADMIN_HEADERS, register_and_login
+from database import get_engine
+
+def test_authenticated_requests_use_principal_cache(client):
+    """반복 인증 요청은 캐시에서 사용자 정보를 조회"""
+    principal_cache.clear()
+    headers = register_and_login(client, "cacheuser")
+    before = principal_cache.stats()
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert client.get("/protected", headers=headers).status_code == 200
+    assert client.get("/users/me", headers=headers).json()["id"] == "cacheuser"
+    after = principal_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+def test_deleted_user_is_invalidated(client):
+    """사용자 삭제 시 캐시 무효화되어 더 이상 인증되지 않음"""
+    headers = register_and_login(client, "deleteduser")
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    async def remove():
+        async with get_engine().sessionmaker()() as db:
+            return await delete_user(db, "deleteduser")
+
+    assert client.portal.call(remove)
+    assert client.get("/users/me", headers=headers).status_code == 401
+
+def test_refresh_token_rotation_and_reuse_detection(client, monkeypatch):
+    """리프레시 토큰은 회전되고, 회전된 토큰을 재사용하면 같은 로그인의 토큰이 모두 폐기"""
+    import refresh_tokens
+
+    # 유예 시간 없이 바로 재사용으로 판단
+    monkeypatch.setattr(refresh_tokens, "REFRESH_TOKEN_REUSE_GRACE_SECONDS", 0)
+    client.post("/register", json={"id": "refresher", "password": "testpass123"})
+    login = client.post("/token", data={"username": "refresher", "password": "testpass123"}).json()
+    first = login["refresh_token"]
+
+    hashing_before = client.get("/stats", headers=ADMIN_HEADERS).json()["hashing"]
+    refreshed = client.post("/token/refresh", json={"refresh_token": first})
+    assert refreshed.status_code == 200
+    second = refreshed.json()["refresh_token"]
+    assert second != first
+    # 갱신에는 패스워드 해싱이 없음
+    assert client.get("/stats", headers=ADMIN_HEADERS).json()["hashing"] == hashing_before
+    headers = {"Authorization": f"Bearer {refreshed.json()['access_token']}"}
+    assert client.get("/users/me", headers=headers).json()["id"] == "refresher"
+
+    # 이미 회전된 토큰 재사용 -> 거부되고 최신 토큰도 폐기
+    assert client.post("/token/refresh", json={"refresh_token": first}).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": second}).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": "unknown"}).status_code == 401
+
+def test_concurrent_refresh_keeps_winner_token(client):
+    """같은 토큰으로 동시에 갱신하면 한 요청만 성공하고, 진 요청이 이긴 요청의 새 토큰을 폐기하지 않음"""
+    from database import engineconn
+    from refresh_tokens import rotate_refresh_token
+
+    client.post("/register", json={"id": "racer", "password": "testpass123"})
+    token = client.post("/token", data={"username": "racer", "password": "testpass123"}).json()["refresh_token"]
+
+    async def rotate(engine):
+        async with engine.sessionmaker()() as db:
+            try:
+                _, new_token = await rotate_refresh_token(db, token)
+                await db.commit()
+                return new_token
+            except HTTPException as e:
+                await db.rollback()
+                return e.status_code
+
+    async def race():
+        engine = engineconn()
+        try:
+            return await asyncio.gather(rotate(engine), rotate(engine))
+        finally:
+            await engine.dispose()
+
+    results = asyncio.run(race())
+    winners = [result for result in results if isinstance(result, str)]
+    assert len(winners) == 1
+    assert 401 in results
+    # 재시도한 클라이언트도 이긴 요청의 새 토큰으로 계속 갱신 가능
+    refreshed = client.post("/token/refresh", json={"refresh_token": winners[0]})
+    assert refreshed.status_code == 200
+
+def test_refresh_token_revocation(client):
+    """로그아웃한 토큰과 모든 기기 로그아웃 후의 토큰은 갱신 불가"""
+    client.post("/register", json={"id": "revoker", "password": "testpass123"})
+    tokens = [
+        client.post("/token", data={"username": "revoker", "password": "testpass123"}).json()
+        for _ in range(3)
+    ]
+    assert client.post("/token/revoke", json={"refresh_token": tokens[0]["refresh_token"]}).status_code == 204
+    assert client.post("/token/refresh", json={"refresh_token": tokens[0]["refresh_token"]}).status_code == 401
+    # 다른 로그인은 영향 없음
+    assert client.post("/token/refresh", json={"refresh_token": tokens[1]["refresh_token"]}).status_code == 200
+
+    headers = {"Authorization": f"Bearer {tokens[2]['access_token']}"}
+    assert client.post("/users/me/logout-all", headers=headers).status_code == 204
+    assert client.post("/token/refresh", json={"refresh_token": tokens[2]["refresh_token"]}).status_code == 401
@@ -0,0 +1,10 @@
+from benchmarks.common import percentile
+
+def test_percentile_uses_nearest_rank():
+    """최근접 순위 방식 - 순위가 정수로 떨어져도 한 칸 밀리지 않음"""
+    hundred = list(range(1, 101))
+    assert [percentile(hundred, p) for p in (7, 50, 95, 99, 100)] == [7, 50, 95, 99, 100]
+    ten = list(range(10, 0, -1))
+    assert [percentile(ten, p) for p in (0, 50, 55, 90, 99)] == [1, 5, 6, 9, 10]
+    assert percentile([7.5], 99) == 7.5
+    assert percentile([], 50) == 0.0
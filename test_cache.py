@@ -0,0 +1,37 @@
+from cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction():
+    """최대 크기 초과 시 가장 오래 사용되지 않은 항목 퇴출"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry_and_bound():
+    """항목별 TTL은 기본 TTL을 넘지 않고 만료 시 미스"""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    cache.set("short", 1, ttl=2)
+    cache.set("long", 2, ttl=100)
+    cache.set("expired", 3, ttl=-1)
+    clock.now = 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("expired") is None
+    clock.now = 11
+    assert cache.get("long") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from config import load_settings
+from conftest import ADMIN_HEADERS
+
+def test_settings_read_from_environment():
+    """환경변수 이름 그대로 읽어 타입 변환 (다른 환경변수는 무시)"""
+    settings = load_settings({
+        "DB_POOL_SIZE": "25",
+        "DB_POOL_PRE_PING": "false",
+        "DB_REPLICA_URLS": "sqlite:///a.db, sqlite:///b.db",
+        "TOKEN_CACHE_TTL": "60",
+        "HOME": "/root",
+    })
+    assert settings.db_pool_size == 25
+    assert settings.db_pool_pre_ping is False
+    assert settings.db_replica_urls == ["sqlite:///a.db", "sqlite:///b.db"]
+    assert settings.token_cache_ttl == 60.0
+    assert settings.bcrypt_rounds == 12
+
+def test_environment_overrides_config_file(tmp_path):
+    """설정 파일 값을 쓰되 같은 키는 환경변수가 우선"""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"DB_POOL_SIZE": 40, "HASH_WORKERS": 8}))
+    settings = load_settings({"CONFIG_FILE": str(path), "HASH_WORKERS": "2"})
+    assert settings.db_pool_size == 40
+    assert settings.hash_workers == 2
+
+def test_invalid_settings_fail_with_every_problem(tmp_path):
+    """잘못된 값은 시작 시 항목별 사유와 함께 거부"""
+    with pytest.raises(ValueError) as error:
+        load_settings({"DB_POOL_SIZE": "0", "SQL_PROFILE_MODE": "verbose", "RATE_LIMIT_LOGIN_IP": "30"})
+    message = str(error.value)
+    assert "DB_POOL_SIZE" in message
+    assert "SQL_PROFILE_MODE" in message
+    assert "RATE_LIMIT_LOGIN_IP" in message
+
+    # 설정 파일의 오타도 무시하지 않음
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"DB_POOL_SIZ": 40}))
+    with pytest.raises(ValueError, match="DB_POOL_SIZ"):
+        load_settings({"CONFIG_FILE": str(path)})
+
+def test_production_requires_secret_key():
+    """production 환경은 기본 JWT 비밀 키로 시작할 수 없음"""
+    with pytest.raises(ValueError, match="JWT_SECRET_KEY"):
+        load_settings({"APP_ENV": "production"})
+    settings = load_settings({"APP_ENV": "production", "JWT_SECRET_KEY": "x" * 32})
+    assert settings.jwt_secret_key.get_secret_value() == "x" * 32
+
+def test_config_endpoint_redacts_secrets(client):
+    """설정 조회 API는 관리자 전용이며 비밀 값은 가림"""
+    assert client.get("/admin/config").status_code == 403
+    response = client.get("/admin/config", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    config = response.json()
+    assert config["ADMIN_API_KEY"] == "**********"
+    assert config["JWT_SECRET_KEY"] == "**********"
+    assert "test-admin-key" not in response.text
+    assert config["DB_POOL_SIZE"] >= 1
+
+    redacted = load_settings({"DB_URL": "mysql://root:secretpw@db:3306/app"}).redacted()
+    assert "secretpw" not in redacted["DB_URL"]
@@ -0,0 +1,121 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from conftest import ADMIN_HEADERS, register_and_login
+from database import ReplicaRouter, init_engine, get_engine, dispose_engine, engineconn, to_async_url
+
+def test_registry_returns_single_engine():
+    """전역 레지스트리는 하나의 엔진을 공유"""
+    asyncio.run(dispose_engine())
+    first = init_engine()
+    assert get_engine() is first
+    assert init_engine() is first
+    asyncio.run(dispose_engine())
+    assert get_engine() is not first
+    asyncio.run(dispose_engine())
+
+def test_async_driver_mapping():
+    """동기 드라이버 URL을 비동기 드라이버로 변환"""
+    assert to_async_url("mysql://u:p@localhost/db").drivername == "mysql+aiomysql"
+    assert to_async_url("mysql+aiomysql://u:p@localhost/db").drivername == "mysql+aiomysql"
+    assert to_async_url("sqlite:///test.db").drivername == "sqlite+aiosqlite"
+
+def test_pool_settings_are_configurable(tmp_path):
+    """풀 크기/오버플로/타임아웃/리사이클 설정 반영"""
+    engine = engineconn(
+        url=f"sqlite:///{tmp_path / 'pool.db'}",
+        pool_size=3,
+        max_overflow=2,
+        pool_timeout=7,
+        pool_recycle=60,
+    )
+    status = engine.pool_status()
+    assert status["size"] == 3
+    assert status["max_overflow"] == 2
+    assert status["timeout"] == 7
+    assert status["recycle"] == 60
+
+    async def checkout():
+        async with engine.connection():
+            assert engine.pool_status()["checkedout"] == 1
+        assert engine.pool_status()["checkedout"] == 0
+        await engine.dispose()
+
+    asyncio.run(checkout())
+
+def test_requests_share_application_engine(client):
+    """lifespan에서 생성한 엔진을 요청들이 공유"""
+    engine = get_engine()
+    assert client.get("/health").json()["status"] == "healthy"
+    client.post("/register", json={"id": "pooluser", "password": "poolpass"})
+    assert get_engine() is engine
+    stats = client.get("/stats", headers=ADMIN_HEADERS).json()["db_pool"]
+    assert stats["checkedout"] == 0
+
+def test_replica_router_sticks_to_primary_after_write():
+    """복제본을 차례로 사용하고 최근 쓰기가 있었던 사용자는 기본 DB로 고정"""
+    router = ReplicaRouter(sticky_seconds=60)
+    primary, first, second = object(), object(), object()
+    assert router.choose(primary, []) is primary
+    assert [router.choose(primary, [first, second], 1) for _ in range(2)] == [first, second]
+    router.mark_write(1)
+    assert router.choose(primary, [first, second], 1) is primary
+    assert router.choose(primary, [first, second], 2) in (first, second)
+    stats = router.stats()
+    assert (stats["primary_reads"], stats["replica_reads"], stats["sticky_reads"]) == (1, 3, 1)
+
+def test_read_endpoints_use_replica_with_read_your_writes(tmp_path, monkeypatch):
+    """조회 API는 복제본에서 응답하고, 잔액 변경 직후에는 기본 DB에서 응답"""
+    import database
+    from app import app
+    from models import Base, User, UserWallet
+
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setattr(database, "DB_REPLICA_URLS", [replica_url])
+
+    async def reset_schemas():
+        for url in (database.DB_URL, replica_url):
+            engine = engineconn(url=url)
+            async with engine.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            await engine.dispose()
+
+    asyncio.run(reset_schemas())
+    asyncio.run(dispose_engine())
+    with TestClient(app) as client:
+        headers = register_and_login(client, "replicauser")
+        user_id = client.get("/users/me", headers=headers).json()["user_id"]
+
+        async def seed_replica():
+            # 복제본에만 다른 잔액을 넣어 어느 DB에서 응답했는지 구분
+            engine = engineconn(url=replica_url)
+            async with engine.sessionmaker()() as db:
+                db.add(User(user_id=user_id, id="replicauser", password="x"))
+                db.add(UserWallet(user_id=user_id, money=777))
+                await db.commit()
+            await engine.dispose()
+
+        asyncio.run(seed_replica())
+        assert client.get("/users/me/wallet", headers=headers).json()["money"] == 777
+
+        # 쓰기 직후 조회는 복제 지연과 관계없이 기본 DB의 값
+        client.put("/users/me/wallet/add?amount=10", headers=headers)
+        assert client.get("/users/me/wallet", headers=headers).json()["money"] == 10
+        assert client.get("/stats", headers=ADMIN_HEADERS).json()["db_replicas"]["sticky_reads"] == 1
+
+        # 고정 시간이 지나면 다시 복제본
+        database.replica_router.reset()
+        assert client.get("/users/me/wallet", headers=headers).json()["money"] == 777
+
+        # 복제본에 아직 없는 신규 사용자도 인증은 기본 DB로 확인
+        new_headers = register_and_login(client, "freshuser")
+        assert client.get("/users/me", headers=new_headers).status_code == 200
+
+        # 복제본 주소가 담기므로 관리자만 조회 가능
+        assert client.get("/stats").status_code == 403
+        stats = client.get("/stats", headers=ADMIN_HEADERS).json()["db_replicas"]
+        assert len(stats["replicas"]) == 1
+        assert stats["replica_reads"] >= 1
+    asyncio.run(dispose_engine())
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import ADMIN_HEADERS
+from hashing import HashExecutor
+
+def test_runs_function_and_records_timings():
+    """워커 풀 실행 결과 반환 및 대기/실행 시간 기록"""
+    executor = HashExecutor(workers=2, max_pending=2)
+    assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+    stats = executor.stats()
+    assert stats["wait"]["count"] == 1
+    assert stats["run"]["count"] == 1
+    assert stats["in_flight"] == 0
+    executor.shutdown()
+
+def test_rejects_with_503_when_saturated():
+    """실행/대기 슬롯이 가득 차면 즉시 503 거부"""
+    executor = HashExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
+
+def test_login_uses_hash_executor(client):
+    """회원가입/로그인 해싱이 워커 풀에서 수행"""
+    client.post("/register", json={"id": "hashuser", "password": "hashpass"})
+    client.post("/token", data={"username": "hashuser", "password": "hashpass"})
+    assert client.get("/stats", headers=ADMIN_HEADERS).json()["hashing"]["run"]["count"] >= 2
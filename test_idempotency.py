@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import add_stocks, register_and_login
+from idempotency import IdempotencyStore, idempotency_store
+from models import UserWalletResponse
+
+def test_retried_credit_is_applied_once(client):
+    """같은 키로 재시도한 충전은 지갑을 건드리지 않고 원래 응답을 재응답"""
+    headers = register_and_login(client, "retrier")
+    keyed = {**headers, "Idempotency-Key": "credit-1"}
+    first = client.put("/users/me/wallet/add?amount=10", headers=keyed)
+    retry = client.put("/users/me/wallet/add?amount=10", headers=keyed)
+    assert first.json() == retry.json() == {"user_id": first.json()["user_id"], "money": 10.0}
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert client.put("/users/me/wallet/add?amount=5", headers={**headers, "Idempotency-Key": "credit-2"}).json()["money"] == 15
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 15
+    assert len(client.get("/users/me/wallet/history", headers=headers).json()["entries"]) == 2
+
+    # 같은 키를 다른 요청에 재사용하면 거부
+    assert client.put("/users/me/wallet/add?amount=99", headers=keyed).status_code == 422
+    # 키는 사용자 단위로 분리
+    other = register_and_login(client, "otherretrier")
+    assert client.put("/users/me/wallet/add?amount=10", headers={**other, "Idempotency-Key": "credit-1"}).headers.get("Idempotent-Replayed") is None
+
+def test_failed_order_is_not_remembered(client):
+    """실패한 주문은 저장하지 않으므로 같은 키로 다시 시도 가능"""
+    headers = register_and_login(client, "orderretrier")
+    (j_id,) = add_stocks(("카카오", 100))
+    keyed = {**headers, "Idempotency-Key": "buy-1"}
+    order = {"j_id": j_id, "quantity": 2}
+    assert client.post("/users/me/orders/buy", json=order, headers=keyed).status_code == 400
+    client.put("/users/me/wallet/add?amount=1000", headers=headers)
+    assert client.post("/users/me/orders/buy", json=order, headers=keyed).json()["money"] == 800
+    assert client.post("/users/me/orders/buy", json=order, headers=keyed).json()["holding_quantity"] == 2
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 800
+
+def test_database_store_dedupes_across_workers(client, monkeypatch):
+    """DB 저장소는 인메모리 캐시가 비어 있는 다른 워커의 재시도도 재응답"""
+    monkeypatch.setattr(idempotency_store, "use_db", True)
+    headers = register_and_login(client, "multiworker")
+    keyed = {**headers, "Idempotency-Key": "credit-db"}
+    assert client.put("/users/me/wallet/add?amount=7", headers=keyed).json()["money"] == 7
+    idempotency_store.cache.clear()
+    retry = client.put("/users/me/wallet/add?amount=7", headers=keyed)
+    assert retry.json()["money"] == 7
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 7
+
+class _FakeSession:
+    async def commit(self):
+        pass
+
+def test_concurrent_duplicate_is_rejected_while_in_flight():
+    """처리 중인 키로 들어온 요청은 409"""
+    store = IdempotencyStore(maxsize=10, ttl=60, use_db=False)
+    db = _FakeSession()
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_operation():
+            started.set()
+            await release.wait()
+            return UserWalletResponse(user_id=1, money=1.0)
+
+        first = asyncio.create_task(store.execute(db, 1, "k", "fp", UserWalletResponse, slow_operation))
+        await started.wait()
+        with pytest.raises(HTTPException) as exc:
+            await store.execute(db, 1, "k", "fp", UserWalletResponse, slow_operation)
+        release.set()
+        return exc.value.status_code, await first
+
+    status_code, (response, replayed) = asyncio.run(scenario())
+    assert status_code == 409
+    assert response.money == 1.0 and replayed is False
+    assert store.stats()["conflicts"] == 1
@@ -0,0 +1,67 @@
+import asyncio
+import random
+from decimal import Decimal
+
+from conftest import add_stocks, register_and_login, run_in_db
+from leaderboard import IndexableSkipList, leaderboard
+
+def test_skip_list_matches_sorted_list():
+    """스킵 리스트 순위 조회가 정렬 리스트와 일치"""
+    skip_list = IndexableSkipList()
+    reference = []
+    rng = random.Random(7)
+    for _ in range(2000):
+        key = (rng.randint(0, 500), rng.randint(0, 10**6))
+        if reference and rng.random() < 0.3:
+            victim = reference.pop(rng.randrange(len(reference)))
+            skip_list.remove(victim)
+        elif key not in reference:
+            reference.append(key)
+            skip_list.insert(key)
+    reference.sort()
+    assert len(skip_list) == len(reference)
+    assert list(skip_list.head_items(50)) == reference[:50]
+    for position in range(0, len(reference), 37):
+        assert skip_list.index(reference[position]) == position
+    assert skip_list.index((-1, -1)) is None
+
+def test_leaderboard_tracks_wallets_trades_and_prices(client):
+    """지갑/주문/가격 변경이 순위에 증분 반영되고 재계산 결과와 일치"""
+    rich = register_and_login(client, "rich")
+    poor = register_and_login(client, "poor")
+    (j_id,) = add_stocks(("성장주", 100))
+    assert [entry["id"] for entry in client.get("/leaderboard").json()["entries"]] == ["rich", "poor"]
+
+    client.post("/users/me/wallet", json={"money": 1000}, headers=rich)
+    client.post("/users/me/wallet", json={"money": 600}, headers=poor)
+    client.post("/users/me/orders/buy", json={"j_id": j_id, "quantity": 5}, headers=poor)
+    top = client.get("/leaderboard").json()["entries"]
+    assert [(entry["id"], entry["net_worth"]) for entry in top] == [("rich", 1000), ("poor", 600)]
+
+    leaderboard.set_prices({j_id: Decimal("200")})
+    assert client.get("/leaderboard/me", headers=poor).json() == {
+        "rank": 1, "user_id": top[1]["user_id"], "id": "poor", "net_worth": 1100,
+    }
+
+    async def reprice(db):
+        from sqlalchemy import update
+        from models import Stock
+        await db.execute(update(Stock).where(Stock.j_id == j_id).values(price=200))
+        await db.commit()
+
+    run_in_db(reprice)
+    before = client.get("/leaderboard").json()
+    client.portal.call(leaderboard.rebuild)
+    assert client.get("/leaderboard").json() == before
+    assert client.get("/leaderboard?limit=1").json()["entries"][0]["id"] == "poor"
+
+def test_concurrent_first_requests_build_once(client):
+    """동시에 들어온 첫 조회는 재계산을 한 번만 실행 (뒤의 재계산이 증분 갱신을 버리지 않음)"""
+    register_and_login(client, "first")
+
+    async def first_requests():
+        leaderboard.reset()
+        await asyncio.gather(leaderboard.ensure_built(), leaderboard.ensure_built())
+        return leaderboard.stats()
+
+    assert client.portal.call(first_requests) == {"users": 1, "built": True, "rebuilds": 1}
@@ -0,0 +1,44 @@
+from conftest import register_and_login
+from metrics import Histogram, registry
+
+def _sample(text: str, prefix: str) -> float:
+    """지표 출력에서 prefix로 시작하는 줄의 값"""
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} 없음")
+
+def test_metrics_endpoint_reports_routes_db_and_auth(client):
+    """라우트 템플릿별 요청 수/처리 시간과 요청당 SQL, 해싱/JWT 시간이 Prometheus 형식으로 노출"""
+    registry.reset()
+    headers = register_and_login(client, "metricuser")
+    client.get("/users/me/wallet", headers=headers)
+    client.get("/stocks/12345")
+    client.get("/stocks/67890")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert _sample(text, 'http_requests_total{method="GET",route="/stocks/{j_id}",status="404"}') == 2
+    assert _sample(text, 'http_request_duration_seconds_count{method="POST",route="/token"}') == 1
+    assert _sample(text, 'http_requests_in_flight{method="GET",route="/users/me/wallet"}') == 0
+    # 지갑 조회는 SQL 1회 (인증 정보는 로그인 직후라 캐시되지 않았으므로 사용자 조회 1회 추가)
+    assert _sample(text, 'http_request_db_queries_sum{route="/users/me/wallet"}') == 2
+    assert _sample(text, 'password_hash_seconds_count{operation="get_password_hash"}') == 1
+    assert _sample(text, 'password_hash_seconds_count{operation="verify_and_update_password"}') == 1
+    assert _sample(text, 'jwt_seconds_count{operation="sign"}') == 1
+    assert _sample(text, "db_pool_checkout_wait_seconds_count") >= 1
+    assert 'db_pool_connections{state="checkedout"}' in text
+
+def test_histogram_buckets_are_cumulative():
+    """히스토그램 구간은 누적 개수로 출력"""
+    histogram = Histogram("test_seconds", "테스트", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe("x", value=value)
+    lines = histogram.samples()
+    assert 'test_seconds_bucket{op="x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{op="x",le="1"} 3' in lines
+    assert 'test_seconds_bucket{op="x",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{op="x"} 4' in lines
+    assert histogram.sum("x") == 6.05
@@ -0,0 +1,54 @@
+from sqlalchemy import select
+
+from conftest import ADMIN_HEADERS, register_and_login, run_in_db
+from models import User
+from profiler import parameters_shape, sql_profiler, statement_shape
+
+def test_profile_flags_repeated_statement_shapes(client):
+    """같은 모양의 문장을 반복 실행하면 N+1로 표시하고 매개변수는 모양만 기록"""
+    async def n_plus_one(db):
+        for user_id in range(1, 5):
+            await db.execute(select(User).where(User.user_id == user_id))
+        await db.execute(select(User).where(User.user_id.in_([1, 2, 3])))
+
+    with sql_profiler.profile("n+1 test") as profile:
+        run_in_db(n_plus_one)
+    summary = profile.summary()
+    assert summary["statements"] == 5
+    (repeated,) = summary["n_plus_one"]
+    assert repeated["count"] == 4
+    assert "WHERE user.user_id = ?" in repeated["statement"]
+    assert all("1" not in item["parameters"] for item in summary["slowest"])
+    assert sql_profiler.recent(1)[0]["id"] == profile.id
+
+def test_shapes_normalize_placeholders_and_hide_values():
+    """IN 목록 길이와 공백 차이는 같은 모양, 매개변수는 타입만 남김"""
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == statement_shape("SELECT * FROM t WHERE id IN (?, ?)")
+    assert parameters_shape((1, "secret"), False) == "(int, str)"
+    assert parameters_shape({"b": 1.5, "a": None}, False) == "{a: NoneType, b: float}"
+    assert parameters_shape([(1,), (2,)], True) == "executemany x2 of (int)"
+
+def test_header_toggles_request_profiling(client, monkeypatch):
+    """header 모드에서는 X-SQL-Profile 헤더와 관리자 API 키가 있는 요청만 프로파일링하고 관리자 API로 조회"""
+    monkeypatch.setattr(sql_profiler, "mode", "header")
+    headers = register_and_login(client, "profiled")
+    assert "X-SQL-Profile" not in client.get("/users/me/wallet", headers=headers).headers
+
+    response = client.get("/users/me/wallet", headers={**headers, **ADMIN_HEADERS, "X-SQL-Profile": "1"})
+    assert "statements=1;" in response.headers["X-SQL-Profile"]
+    profiles = client.get("/admin/sql-profiles", headers=ADMIN_HEADERS).json()["profiles"]
+    assert profiles[0]["label"] == "GET /users/me/wallet"
+    assert profiles[0]["statements"] == 1
+    assert client.get("/admin/sql-profiles").status_code == 403
+
+def test_header_without_admin_key_is_not_profiled(client, monkeypatch):
+    """관리자 API 키 없이 X-SQL-Profile 헤더만 보낸 요청은 프로파일링하지 않음"""
+    monkeypatch.setattr(sql_profiler, "mode", "header")
+    sql_profiler.reset()
+    headers = register_and_login(client, "anonymous")
+    for admin_key in (None, "wrong-key"):
+        extra = {"X-Admin-Key": admin_key} if admin_key else {}
+        response = client.get("/users/me/wallet", headers={**headers, **extra, "X-SQL-Profile": "1"})
+        assert response.status_code == 200
+        assert "X-SQL-Profile" not in response.headers
+    assert sql_profiler.stats()["profiled"] == 0
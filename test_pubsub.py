@@ -0,0 +1,76 @@
+import asyncio
+
+from pubsub import PubSubHub, price_topic, sse_events, wallet_topic
+
+def test_publish_reaches_topic_subscribers():
+    """발행된 메시지는 해당 토픽 구독자에게만 전달"""
+    async def scenario():
+        hub = PubSubHub(queue_size=10)
+        wallet = hub.subscribe([wallet_topic(1)])
+        prices = hub.subscribe([price_topic(7), price_topic(8)])
+        assert hub.publish(price_topic(7), {"type": "price", "j_id": 7, "price": 10.0}) == 1
+        assert hub.publish(wallet_topic(2), {"type": "wallet"}) == 0
+        assert (await prices.get())["j_id"] == 7
+        assert wallet.queue.empty()
+        hub.unsubscribe(prices)
+        assert hub.stats()["subscriptions"] == 1
+
+    asyncio.run(scenario())
+
+def test_slow_consumer_is_dropped():
+    """대기열이 가득 찬 구독은 해제되고 종료 신호를 받음"""
+    async def scenario():
+        hub = PubSubHub(queue_size=2)
+        slow = hub.subscribe([price_topic(1)])
+        fast = hub.subscribe([price_topic(1)])
+        for price in range(3):
+            hub.publish(price_topic(1), {"type": "price", "j_id": 1, "price": price})
+            await fast.get()
+        assert slow.dropped
+        assert await slow.get() is None
+        assert hub.stats()["dropped_slow_consumers"] == 1
+        assert hub.stats()["subscriptions"] == 1
+
+    asyncio.run(scenario())
+
+def test_sse_events_format_and_cleanup():
+    """SSE 형식 변환 및 스트림 종료 시 구독 해제"""
+    async def scenario():
+        hub = PubSubHub(queue_size=10)
+        events = sse_events(hub, [wallet_topic(3)], keepalive=0.01)
+        assert await events.__anext__() == ": connected\n\n"
+        assert await events.__anext__() == ": keepalive\n\n"
+        hub.publish(wallet_topic(3), {"type": "wallet", "user_id": 3, "money": 5.0})
+        assert await events.__anext__() == 'event: wallet\ndata: {"type": "wallet", "user_id": 3, "money": 5.0}\n\n'
+        await events.aclose()
+        assert hub.stats()["subscriptions"] == 0
+
+    asyncio.run(scenario())
+
+def test_unstarted_stream_does_not_subscribe():
+    """첫 반복 전에 닫힌 스트림(응답 전 연결 종료)은 구독을 남기지 않음"""
+    async def scenario():
+        hub = PubSubHub(queue_size=10)
+        events = sse_events(hub, [wallet_topic(3), price_topic(1)])
+        await events.aclose()
+        assert hub.stats()["subscriptions"] == 0
+        assert hub.stats()["topics"] == 0
+
+    asyncio.run(scenario())
+
+def test_wallet_changes_are_published(client):
+    """지갑 변경이 사용자 토픽으로 발행"""
+    from conftest import register_and_login
+    from pubsub import hub
+
+    headers = register_and_login(client, "streamer")
+    user_id = client.get("/users/me", headers=headers).json()["user_id"]
+    subscription = client.portal.call(lambda: _subscribe(hub, user_id))
+    client.put("/users/me/wallet/add?amount=42", headers=headers)
+    message = client.portal.call(subscription.get)
+    assert message == {"type": "wallet", "user_id": user_id, "money": 42.0}
+    hub.unsubscribe(subscription)
+    assert client.get("/stream").status_code == 401
+
+async def _subscribe(hub, user_id):
+    return hub.subscribe([wallet_topic(user_id)])
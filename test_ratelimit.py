@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from conftest import ADMIN_HEADERS
+from ratelimit import InMemoryBucketStore, Limit, rate_limiter
+
+@pytest.fixture
+def limited(monkeypatch):
+    """작은 한도로 요청 제한을 켠 상태"""
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter, "backend", InMemoryBucketStore(shards=4))
+    monkeypatch.setitem(rate_limiter.rules, ("POST", "/token"), [("ip", Limit(6, 60)), ("user", Limit(2, 60))])
+    monkeypatch.setitem(rate_limiter.rules, ("POST", "/register"), [("ip", Limit(3, 60)), ("user", Limit(2, 60))])
+
+def test_login_is_throttled_per_username_before_hashing(client, limited):
+    """같은 사용자 ID로 반복 로그인하면 해싱 전에 429와 Retry-After 반환"""
+    client.post("/register", json={"id": "stuffed", "password": "testpass123"})
+    hashed_before = client.get("/stats", headers=ADMIN_HEADERS).json()["hashing"]["run"]["count"]
+    statuses = [
+        client.post("/token", data={"username": "stuffed", "password": f"guess{i}"}).status_code
+        for i in range(4)
+    ]
+    assert statuses == [401, 401, 429, 429]
+    rejected = client.post("/token", data={"username": "STUFFED", "password": "testpass123"})
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    # 거절된 요청은 패스워드 검증을 하지 않음
+    assert client.get("/stats", headers=ADMIN_HEADERS).json()["hashing"]["run"]["count"] - hashed_before == 2
+    # 다른 사용자는 IP 한도 안에서 계속 로그인 가능
+    client.post("/register", json={"id": "innocent", "password": "testpass123"})
+    assert client.post("/token", data={"username": "innocent", "password": "testpass123"}).status_code == 200
+    assert client.post("/token", data={"username": "another", "password": "x"}).status_code == 429  # IP 한도 소진
+
+def test_register_is_throttled_per_ip(client, limited):
+    """회원가입은 IP 단위로 제한하고 제한 대상이 아닌 경로는 영향 없음"""
+    statuses = [client.post("/register", json={"id": f"spam{i}", "password": "testpass123"}).status_code for i in range(4)]
+    assert statuses == [201, 201, 201, 429]
+    assert client.get("/health").status_code == 200
+    assert client.get("/stats", headers=ADMIN_HEADERS).json()["rate_limit"]["rejected"]["ip"] == 1
+
+def test_register_is_throttled_per_username(client, limited):
+    """같은 ID로 반복 가입을 시도하면 IP 한도와 별개로 ID 단위 제한 (대소문자 무시)"""
+    statuses = [client.post("/register", json={"id": "taken", "password": "testpass123"}).status_code for _ in range(2)]
+    assert statuses == [201, 400]
+    assert client.post("/register", json={"id": "TAKEN", "password": "testpass123"}).status_code == 429
+    assert client.get("/stats", headers=ADMIN_HEADERS).json()["rate_limit"]["rejected"] == {"ip": 0, "user": 1}
+
+def test_bucket_refills_and_idle_buckets_are_evicted():
+    """버킷은 시간에 따라 다시 채워지고, 가득 찬 버킷과 한도를 넘는 키는 제거"""
+    now = [0.0]
+    store = InMemoryBucketStore(shards=1, max_keys=2, clock=lambda: now[0])
+    limit = Limit(2, 10)
+
+    async def take(key):
+        return await store.take(key, limit)
+
+    assert asyncio.run(take("a"))[0] and asyncio.run(take("a"))[0]
+    allowed, retry_after = asyncio.run(take("a"))
+    assert not allowed and retry_after == pytest.approx(5.0)
+    now[0] = 5.0
+    assert asyncio.run(take("a"))[0]
+
+    asyncio.run(take("b"))
+    asyncio.run(take("c"))
+    assert store.stats()["keys"] == 2
+    now[0] = 100.0
+    asyncio.run(take("d"))
+    assert store.stats()["keys"] == 1
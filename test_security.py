@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+from sqlalchemy import select
+
+import security
+from conftest import run_in_db
+from jwt_keys import KeyRing
+from models import User
+from security import SECRET_KEY, build_pwd_context, create_access_token, decode_access_token, verify_token, token_cache
+
+def test_verified_token_is_cached():
+    """검증된 토큰은 캐시에서 재사용"""
+    token_cache.clear()
+    token = create_access_token({"sub": "cached"}, expires_delta=timedelta(minutes=5))
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+    assert first.id == second.id == "cached"
+    assert token_cache.stats()["hits"] >= 1
+    assert verify_token(token) == "cached"
+
+def test_invalid_token_is_not_cached():
+    """검증 실패 결과는 캐시하지 않음"""
+    token_cache.clear()
+    assert decode_access_token("not-a-jwt") is None
+    assert len(token_cache) == 0
+
+def test_cached_token_honours_expiry():
+    """캐시된 토큰도 exp 이후에는 거부"""
+    token_cache.clear()
+    token = create_access_token({"sub": "expiring"}, expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token) is not None
+    time.sleep(2.1)
+    assert decode_access_token(token) is None
+
+def test_login_rehashes_outdated_password_hash(client, monkeypatch):
+    """비용 설정이 바뀌면 로그인 성공 시 저장된 해시를 현재 설정으로 교체"""
+    monkeypatch.setattr(security, "pwd_context", build_pwd_context(bcrypt_rounds=4))
+    client.post("/register", json={"id": "rehashuser", "password": "testpass123"})
+
+    async def stored_hash(db):
+        return (await db.execute(select(User.password).where(User.id == "rehashuser"))).scalar_one()
+
+    assert run_in_db(stored_hash).startswith("$2b$04$")
+    monkeypatch.setattr(security, "pwd_context", build_pwd_context(bcrypt_rounds=5))
+    assert client.post("/token", data={"username": "rehashuser", "password": "wrongpass"}).status_code == 401
+    assert run_in_db(stored_hash).startswith("$2b$04$")
+    assert client.post("/token", data={"username": "rehashuser", "password": "testpass123"}).status_code == 200
+    assert run_in_db(stored_hash).startswith("$2b$05$")
+
+def test_unknown_hash_scheme_is_rejected():
+    """지원하지 않는 해싱 방식은 시작 시 거부"""
+    with pytest.raises(ValueError):
+        build_pwd_context(scheme="md5_crypt")
+
+def test_rs256_keyring_rotation(tmp_path):
+    """키를 회전해도 이전 키로 발급된 토큰은 제거 전까지 검증되고, 같은 키 디렉터리를 읽는 워커는 새 키로 서명"""
+    ring = KeyRing("RS256", keys_dir=str(tmp_path))
+    old_token = ring.sign({"sub": "rotated"})
+    old_kid = jwt.get_unverified_header(old_token)["kid"]
+
+    new_kid = ring.rotate()
+    new_token = ring.sign({"sub": "rotated"})
+    assert jwt.get_unverified_header(new_token)["kid"] == new_kid != old_kid
+    assert {key["kid"] for key in ring.jwks()["keys"]} == {old_kid, new_kid}
+    for token in (old_token, new_token):
+        key = ring.verification_key(jwt.get_unverified_header(token)["kid"])
+        assert jwt.decode(token, key.verify_key, algorithms=["RS256"])["sub"] == "rotated"
+
+    # 같은 디렉터리를 읽는 다른 워커
+    sibling = KeyRing("RS256", keys_dir=str(tmp_path))
+    assert sibling.active.kid == new_kid
+    assert ring.retire(old_kid)
+    assert ring.verification_key(old_kid) is None
+    with pytest.raises(ValueError):
+        ring.retire(new_kid)
+
+def test_rs256_tokens_verify_with_published_jwks(client, monkeypatch, tmp_path):
+    """RS256 토큰은 JWKS 공개 키만으로 API 밖에서도 검증 가능"""
+    ring = KeyRing("RS256", keys_dir=str(tmp_path))
+    monkeypatch.setattr(security, "jwt_keyring", ring)
+    monkeypatch.setattr("app.jwt_keyring", ring)
+    token_cache.clear()
+    client.post("/register", json={"id": "jwksuser", "password": "testpass123"})
+    token = client.post("/token", data={"username": "jwksuser", "password": "testpass123"}).json()["access_token"]
+    assert jwt.get_unverified_header(token)["alg"] == "RS256"
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    keys = client.get("/.well-known/jwks.json").json()["keys"]
+    (public_key,) = [key for key in keys if key["kid"] == jwt.get_unverified_header(token)["kid"]]
+    assert "d" not in public_key
+    assert jwt.decode(token, public_key, algorithms=["RS256"])["sub"] == "jwksuser"
+    # HS256 비밀 키로 위조한 토큰은 거부
+    forged = jwt.encode({"sub": "jwksuser"}, SECRET_KEY, algorithm="HS256", headers={"kid": public_key["kid"]})
+    assert decode_access_token(forged) is None
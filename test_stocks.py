@@ -0,0 +1,141 @@
+import asyncio
+from decimal import Decimal
+
+import prices
+from catalog import stock_catalog
+from prices import PriceIngestor, price_ingestor
+from conftest import ADMIN_HEADERS, add_stocks
+
+def test_stock_catalog_serves_from_snapshot(client):
+    """주식 목록은 한 번 로딩한 스냅샷에서 응답"""
+    samsung, kakao = add_stocks(("삼성전자", 70000, "반도체"), ("카카오", 50000, "플랫폼"))
+
+    listing = client.get("/stocks").json()
+    assert listing == [
+        {"j_id": samsung, "name": "삼성전자", "price": 70000},
+        {"j_id": kakao, "name": "카카오", "price": 50000},
+    ]
+    detailed = client.get("/stocks?include_explanation=true").json()
+    assert detailed[0]["explanation"] == "반도체"
+    assert client.get(f"/stocks/{kakao}").json()["explanation"] == "플랫폼"
+    assert client.get("/stocks/999999").status_code == 404
+    assert stock_catalog.stats()["loads"] == 1
+
+def test_stock_catalog_reloads_after_invalidate(client):
+    """무효화 후에는 새 데이터를 다시 로딩"""
+    assert client.get("/stocks").json() == []
+    (naver,) = add_stocks(("네이버", 200000))
+    assert client.get("/stocks").json() == []
+    stock_catalog.invalidate()
+    assert client.get("/stocks").json()[0]["j_id"] == naver
+    stock_catalog.apply_prices({naver: 210000})
+    assert client.get(f"/stocks/{naver}").json()["price"] == 210000
+    assert stock_catalog.stats()["loads"] == 2
+
+def test_price_ticks_are_coalesced_and_fanned_out(client):
+    """시세 틱은 종목별로 병합되어 한 번에 반영되고 캐시에 전파"""
+    first, second = add_stocks(("가", 100), ("나", 200))
+    client.get("/stocks")
+    ticks = [{"j_id": first, "price": 100 + i} for i in range(50)]
+    ticks += [{"j_id": second, "price": 250}, {"j_id": 999999, "price": 1}, {"j_id": first, "price": -5}]
+    response = client.post("/stocks/prices", json=ticks, headers=ADMIN_HEADERS)
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 51, "rejected": 2, "pending": 2}
+
+    before = price_ingestor.stats()["rows_written"]
+    client.portal.call(price_ingestor.flush)
+    assert price_ingestor.stats()["rows_written"] - before == 2
+    assert client.get(f"/stocks/{first}").json()["price"] == 149
+    assert client.get(f"/stocks/{second}").json()["price"] == 250
+
+    stock_catalog.invalidate()
+    assert client.get(f"/stocks/{first}").json()["price"] == 149
+
+def test_price_ingest_requires_admin_key(client):
+    """관리자 키 없이 시세 수신 불가"""
+    assert client.post("/stocks/prices", json=[]).status_code == 403
+
+def test_non_finite_or_oversized_prices_are_rejected(client):
+    """Infinity/NaN/컬럼 범위를 넘는 가격 틱은 수신 단계에서 거절"""
+    (j_id,) = add_stocks(("다", 100))
+    content = "[" + ",".join(
+        '{"j_id": %d, "price": %s}' % (j_id, price) for price in ("Infinity", "NaN", "1e13", "120")
+    ) + "]"
+    response = client.post(
+        "/stocks/prices", content=content, headers={**ADMIN_HEADERS, "Content-Type": "application/json"}
+    )
+    assert response.json() == {"accepted": 1, "rejected": 3, "pending": 1}
+    client.portal.call(price_ingestor.flush)
+    assert client.get(f"/stocks/{j_id}").json()["price"] == 120
+
+def test_flush_drops_rows_that_fail_instead_of_retrying(monkeypatch):
+    """값 오류로 실패하는 행만 버리고 나머지는 반영 - 같은 묶음을 매 주기 재시도하며 막히지 않음"""
+    from sqlalchemy.exc import DataError
+
+    written = {}
+
+    class OutOfRangeConnection:
+        def connection(self):
+            return self
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def execute(self, stmt, rows):
+            # MySQL의 범위 초과 오류처럼 한 행이라도 잘못되면 executemany 전체가 실패
+            if any(row["b_j_id"] == 2 for row in rows):
+                raise DataError("UPDATE stock", rows, Exception("Out of range value for column 'price'"))
+            self._rows = rows
+
+        async def commit(self):
+            written.update({row["b_j_id"]: row["b_price"] for row in self._rows})
+
+        async def rollback(self):
+            self._rows = []
+
+    monkeypatch.setattr(prices, "get_engine", lambda: OutOfRangeConnection())
+    ingestor = PriceIngestor()
+    notified = []
+    ingestor.subscribe(notified.append)
+    for j_id in (1, 2, 3):
+        ingestor.submit(j_id, Decimal(100 + j_id))
+    ingestor.submit(4, Decimal("Infinity"))
+
+    assert asyncio.run(ingestor.flush()) == {1: Decimal(101), 3: Decimal(103)}
+    assert written == {1: Decimal(101), 3: Decimal(103)}
+    assert notified == [{1: Decimal(101), 3: Decimal(103)}]
+    assert ingestor.pending == 0
+    assert ingestor.stats()["dropped"] == 2
+
+def test_cancelled_flush_keeps_pending_ticks(monkeypatch):
+    """반영 도중 취소(종료 시 작업 취소)되어도 병합된 틱은 유실되지 않고 다음 반영 대상으로 남음"""
+    class StalledEngine:
+        def connection(self):
+            return self
+
+        async def __aenter__(self):
+            await asyncio.Event().wait()
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(prices, "get_engine", lambda: StalledEngine())
+    ingestor = PriceIngestor()
+
+    async def scenario():
+        ingestor.submit(1, Decimal("100"))
+        task = asyncio.create_task(ingestor.flush())
+        await asyncio.sleep(0)
+        ingestor.submit(2, Decimal("200"))
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert ingestor.pending == 2
+    assert ingestor.stats()["flushes"] == 0
@@ -0,0 +1,91 @@
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from conftest import add_stocks, register_and_login, run_in_db
+from database import engineconn
+from models import StockOwnership, User, UserWallet
+from trading import buy_stock
+
+def test_buy_and_sell_flow(client):
+    """매수/매도 시 지갑과 보유 수량, 평균 매입가 갱신"""
+    headers = register_and_login(client, "trader")
+    (j_id,) = add_stocks(("삼성전자", 100))
+    client.post("/users/me/wallet", json={"money": 1000}, headers=headers)
+
+    response = client.post("/users/me/orders/buy", json={"j_id": j_id, "quantity": 3}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["money"] == 700
+    assert response.json()["holding_quantity"] == 3
+
+    response = client.post("/users/me/orders/sell", json={"j_id": j_id, "quantity": 2}, headers=headers)
+    assert response.json()["money"] == 900
+    assert response.json()["holding_quantity"] == 1
+
+    assert client.post("/users/me/orders/buy", json={"j_id": j_id, "quantity": 10}, headers=headers).status_code == 400
+    assert client.post("/users/me/orders/sell", json={"j_id": j_id, "quantity": 5}, headers=headers).status_code == 400
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 900
+    assert client.post("/users/me/orders/buy", json={"j_id": 999999, "quantity": 1}, headers=headers).status_code == 404
+    assert client.post("/users/me/orders/buy", json={"j_id": j_id, "quantity": 0}, headers=headers).status_code == 422
+
+    # 실패한 주문은 롤백되어 원장에 남지 않음
+    history = client.get("/users/me/wallet/history", headers=headers).json()["entries"]
+    assert [(e["kind"], e["amount"]) for e in history] == [("sell", 200.0), ("buy", -300.0), ("set", None)]
+
+def test_concurrent_buys_never_overdraw(client):
+    """같은 사용자의 동시 매수 주문이 잔액을 초과하지 않음"""
+    headers = register_and_login(client, "racer")
+    (j_id,) = add_stocks(("카카오", 100))
+    client.post("/users/me/wallet", json={"money": 1000}, headers=headers)
+    orders = 25
+
+    async def scenario():
+        engine = engineconn(pool_size=orders, max_overflow=0)
+        SessionLocal = engine.sessionmaker()
+        async with SessionLocal() as db:
+            user_id = (await db.execute(select(User.user_id).where(User.id == "racer"))).scalar_one()
+
+        async def buy():
+            async with SessionLocal() as db:
+                try:
+                    await buy_stock(db, user_id, j_id, 1)
+                    await db.commit()
+                    return True
+                except Exception:
+                    await db.rollback()
+                    return False
+
+        filled = sum(await asyncio.gather(*(buy() for _ in range(orders))))
+        async with SessionLocal() as db:
+            money = (await db.execute(select(UserWallet.money).where(UserWallet.user_id == user_id))).scalar_one()
+            quantity = (await db.execute(select(StockOwnership.quantity).where(StockOwnership.user_id == user_id))).scalar_one()
+        await engine.dispose()
+        return filled, money, quantity
+
+    filled, money, quantity = asyncio.run(scenario())
+    assert filled == 10
+    assert money == Decimal("0")
+    assert quantity == 10
+
+def test_portfolio_valuation(client):
+    """보유 주식의 매입 원가/평가 금액/손익 계산"""
+    headers = register_and_login(client, "investor")
+    cheap, pricey = add_stocks(("저가주", 10), ("고가주", 1000))
+    client.post("/users/me/wallet", json={"money": 10000}, headers=headers)
+    client.post("/users/me/orders/buy", json={"j_id": cheap, "quantity": 5}, headers=headers)
+    client.post("/users/me/orders/buy", json={"j_id": pricey, "quantity": 2}, headers=headers)
+
+    async def reprice(db):
+        from sqlalchemy import update
+        from models import Stock
+        await db.execute(update(Stock).where(Stock.j_id == pricey).values(price=1100))
+        await db.commit()
+
+    run_in_db(reprice)
+    portfolio = client.get("/users/me/portfolio", headers=headers).json()
+    assert [holding["j_id"] for holding in portfolio["holdings"]] == [cheap, pricey]
+    assert portfolio["holdings"][1]["unrealized_pnl"] == 200
+    assert portfolio["total_cost_basis"] == 2050
+    assert portfolio["total_market_value"] == 2250
+    assert portfolio["total_unrealized_pnl"] == 200
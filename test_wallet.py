@@ -0,0 +1,182 @@
+import asyncio
+import json
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from conftest import ADMIN_HEADERS, register_and_login, run_in_db
+from database import engineconn
+from models import User, UserWallet, WalletAdjustment
+from wallet import apply_wallet_adjustments, credit_wallet
+
+def test_concurrent_credits_keep_exact_balance(client):
+    """동시 충전 요청이 유실 없이 모두 반영"""
+    register_and_login(client, "concurrent")
+    credits = 40
+
+    async def scenario():
+        engine = engineconn(pool_size=credits, max_overflow=0)
+        SessionLocal = engine.sessionmaker()
+        async with SessionLocal() as db:
+            user_id = (await db.execute(select(User.user_id).where(User.id == "concurrent"))).scalar_one()
+
+        async def credit():
+            async with SessionLocal() as db:
+                await credit_wallet(db, user_id, Decimal("2.50"))
+                await db.commit()
+
+        await asyncio.gather(*(credit() for _ in range(credits)))
+        async with SessionLocal() as db:
+            balance = (await db.execute(select(UserWallet.money).where(UserWallet.user_id == user_id))).scalar_one()
+        await engine.dispose()
+        return balance
+
+    assert asyncio.run(scenario()) == Decimal("100.00")
+
+def test_credit_endpoint_returns_new_balance(client):
+    """충전 API는 지갑이 없으면 생성하고 새 잔액을 반환"""
+    headers = register_and_login(client, "creditor")
+    assert client.put("/users/me/wallet/add?amount=10.25", headers=headers).json()["money"] == 10.25
+    assert client.put("/users/me/wallet/add?amount=5", headers=headers).json()["money"] == 15.25
+    assert client.put("/users/me/wallet/add?amount=0", headers=headers).status_code == 400
+
+def _user_id(client, headers):
+    return client.get("/users/me", headers=headers).json()["user_id"]
+
+def test_batch_adjustments_report_per_item_outcomes(client, monkeypatch):
+    """일괄 조정은 묶음 단위로 적용하고 항목별 결과를 반환"""
+    monkeypatch.setattr("app.WALLET_BATCH_SIZE", 2)
+    alice = _user_id(client, register_and_login(client, "batchalice"))
+    bob = _user_id(client, register_and_login(client, "batchbob"))
+    adjustments = [
+        {"user_id": alice, "amount": 100},
+        {"user_id": bob, "amount": 50},
+        {"user_id": alice, "amount": -30},
+        {"user_id": bob, "amount": -80},
+        {"user_id": 999999, "amount": 10},
+        {"user_id": alice, "amount": "abc"},
+    ]
+    response = client.post("/wallets/adjustments", json=adjustments, headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    body = response.json()
+    statuses = [result["status"] for result in body["results"]]
+    assert statuses == ["applied", "applied", "applied", "insufficient_funds", "unknown_user", "invalid"]
+    assert body["results"][2]["money"] == 70
+    assert body["applied"] == 3
+    assert body["rejected"] == 3
+
+def test_batch_adjustments_reject_non_finite_amounts_per_item(client):
+    """NaN/Infinity/범위 초과 금액은 해당 항목만 invalid로 거절하고 같은 묶음의 정상 항목은 적용"""
+    headers = register_and_login(client, "finiteuser")
+    user_id = _user_id(client, headers)
+    lines = [
+        '{"user_id": %d, "amount": 10}' % user_id,
+        '{"user_id": %d, "amount": NaN}' % user_id,
+        '{"user_id": %d, "amount": Infinity}' % user_id,
+        '{"user_id": %d, "amount": 1e13}' % user_id,
+        '{"user_id": %d, "amount": 5}' % user_id,
+    ]
+    for content, content_type in (("[" + ",".join(lines) + "]", "application/json"), ("\n".join(lines), "application/x-ndjson")):
+        response = client.post(
+            "/wallets/adjustments", content=content, headers={**ADMIN_HEADERS, "Content-Type": content_type}
+        )
+        assert [result["status"] for result in response.json()["results"]] == [
+            "applied", "invalid", "invalid", "invalid", "applied",
+        ]
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 30
+
+    # 검증을 거치지 않은 항목과 컬럼 범위를 넘기는 잔액도 항목 단위로 거절
+    async def adjust(db):
+        items = [
+            (0, WalletAdjustment.model_construct(user_id=user_id, amount=float("nan"))),
+            (1, WalletAdjustment(user_id=user_id, amount=9_999_999_999_999)),
+            (2, WalletAdjustment(user_id=user_id, amount=1)),
+        ]
+        results = await apply_wallet_adjustments(db, items)
+        await db.commit()
+        return [result.status for result in results]
+
+    assert run_in_db(adjust) == ["invalid", "invalid", "applied"]
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 31
+
+def test_batch_adjustments_accept_ndjson(client):
+    """NDJSON 스트림 입력 지원"""
+    headers = register_and_login(client, "ndjsonuser")
+    user_id = _user_id(client, headers)
+    lines = "\n".join(json.dumps({"user_id": user_id, "amount": 1.5}) for _ in range(10))
+    response = client.post(
+        "/wallets/adjustments",
+        content=lines,
+        headers={**ADMIN_HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["applied"] == 10
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 15
+
+def test_batch_adjustments_require_admin_key(client):
+    """관리자 키 없이 일괄 조정 불가"""
+    assert client.post("/wallets/adjustments", json=[]).status_code == 403
+
+def test_wallet_read_does_not_create_row(client):
+    """지갑 조회는 쓰기 없이 잔액 0 반환, 생성 API는 upsert로 덮어쓰기"""
+    headers = register_and_login(client, "readonly")
+    user_id = _user_id(client, headers)
+    assert client.get("/users/me/wallet", headers=headers).json() == {"user_id": user_id, "money": 0}
+
+    async def wallet_rows():
+        engine = engineconn()
+        async with engine.sessionmaker()() as db:
+            rows = (await db.execute(select(UserWallet).where(UserWallet.user_id == user_id))).all()
+        await engine.dispose()
+        return len(rows)
+
+    assert asyncio.run(wallet_rows()) == 0
+    assert client.post("/users/me/wallet", json={"money": 300}, headers=headers).json()["money"] == 300
+    assert client.post("/users/me/wallet", json={"money": 120}, headers=headers).json()["money"] == 120
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 120
+    assert asyncio.run(wallet_rows()) == 1
+
+def test_wallet_history_pages_ledger_with_cursor(client):
+    """모든 잔액 변경이 원장에 남고 키셋 커서로 최신순 페이지 조회"""
+    headers = register_and_login(client, "historian")
+    client.post("/users/me/wallet", json={"money": 100}, headers=headers)
+    for amount in (1, 2, 3):
+        client.put(f"/users/me/wallet/add?amount={amount}", headers=headers)
+    client.post("/wallets/adjustments", json=[{"user_id": _user_id(client, headers), "amount": -6}], headers=ADMIN_HEADERS)
+
+    first = client.get("/users/me/wallet/history?limit=3", headers=headers).json()
+    assert [(e["kind"], e["amount"], e["balance_after"]) for e in first["entries"]] == [
+        ("adjustment", -6.0, 100.0), ("credit", 3.0, 106.0), ("credit", 2.0, 103.0),
+    ]
+    second = client.get(f"/users/me/wallet/history?limit=3&cursor={first['next_cursor']}", headers=headers).json()
+    assert [(e["kind"], e["amount"]) for e in second["entries"]] == [("credit", 1.0), ("set", None)]
+    assert second["entries"][1]["balance_after"] == 100.0
+    assert second["next_cursor"] is None
+
+def test_balance_writes_do_not_lock_missing_wallets(client):
+    """잔액 설정과 일괄 조정은 없는 지갑 행을 잠가 읽지 않음 (MySQL 갭 잠금 교착 방지)"""
+    from profiler import QueryProfile, current_profile
+    from wallet import apply_wallet_adjustments, set_wallet_balance
+    from models import WalletAdjustment
+
+    headers = register_and_login(client, "nolock")
+    user_id = _user_id(client, headers)
+
+    async def scenario():
+        engine = engineconn()
+        profile = QueryProfile("test")
+        token = current_profile.set(profile)
+        try:
+            async with engine.sessionmaker()() as db:
+                await set_wallet_balance(db, user_id, Decimal("50"))
+                await db.commit()
+                await apply_wallet_adjustments(db, [(0, WalletAdjustment(user_id=user_id, amount=5))])
+                await db.commit()
+        finally:
+            current_profile.reset(token)
+            await engine.dispose()
+        return [statement for statement, _, _, _ in profile.statements]
+
+    statements = asyncio.run(scenario())
+    # 잔액 설정은 이전 잔액을 읽지 않고 upsert와 원장 기록만 실행
+    assert [statement.split()[0] for statement in statements[:2]] == ["INSERT", "INSERT"]
+    assert client.get("/users/me/wallet", headers=headers).json()["money"] == 55
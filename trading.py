@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import OrderResponse, Stock, StockOwnership, UserWallet
+from wallet import append_ledger, credit_wallet, supports_returning, upsert_statement
+
+# 주문 처리 규칙
+# - 한 주문은 하나의 짧은 트랜잭션에서 처리하며 커밋/롤백은 호출자가 수행
+# - 매수/매도 모두 지갑 행 -> 보유 주식 행 순서로 잠가 같은 사용자의 동시 주문 간 교착을 방지
+# - 잔액/보유 수량 검사는 조건부 단일 UPDATE(WHERE money >= :cost 등)로 처리하여 초과 인출 방지
+
+async def _get_price(db: AsyncSession, j_id: int) -> Decimal:
+    result = await db.execute(select(Stock.price).where(Stock.j_id == j_id))
+    price = result.scalar_one_or_none()
+    if price is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="존재하지 않는 주식입니다."
+        )
+    return Decimal(price)
+
+async def _debit_wallet(db: AsyncSession, user_id: int, amount: Decimal, kind: str) -> Decimal:
+    """잔액이 충분할 때만 차감하고 새 잔액 반환"""
+    stmt = (
+        update(UserWallet)
+        .where(UserWallet.user_id == user_id, UserWallet.money >= amount)
+        .values(money=UserWallet.money - amount)
+        .execution_options(synchronize_session=False)
+    )
+    if supports_returning(db):
+        result = await db.execute(stmt.returning(UserWallet.money))
+        money = result.scalar_one_or_none()
+    else:
+        result = await db.execute(stmt)
+        money = None
+        if result.rowcount:
+            money = (await db.execute(select(UserWallet.money).where(UserWallet.user_id == user_id))).scalar_one()
+    if money is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지갑 잔액이 부족합니다."
+        )
+    await append_ledger(db, [{"user_id": user_id, "amount": -amount, "balance_after": money, "kind": kind}])
+    return money
+
+async def _holding_quantity(db: AsyncSession, user_id: int, j_id: int) -> int:
+    result = await db.execute(
+        select(StockOwnership.quantity).where(StockOwnership.user_id == user_id, StockOwnership.j_id == j_id)
+    )
+    return result.scalar_one_or_none() or 0
+
+async def buy_stock(db: AsyncSession, user_id: int, j_id: int, quantity: int) -> OrderResponse:
+    """주식 매수 - 지갑 차감 후 보유 수량 증가 (평균 매입가 갱신)"""
+    price = await _get_price(db, j_id)
+    amount = price * quantity
+    money = await _debit_wallet(db, user_id, amount, "buy")
+
+    stmt = upsert_statement(
+        db,
+        StockOwnership,
+        {"user_id": user_id, "j_id": j_id, "price_at_time": price, "quantity": quantity},
+        ["user_id", "j_id"],
+        # price_at_time(평균 매입가)를 먼저 계산해야 MySQL에서도 갱신 전 quantity를 사용
+        lambda new: {
+            "price_at_time": (StockOwnership.price_at_time * StockOwnership.quantity + new.price_at_time * new.quantity)
+            / (StockOwnership.quantity + new.quantity),
+            "quantity": StockOwnership.quantity + new.quantity,
+        },
+    )
+    if supports_returning(db):
+        holding = (await db.execute(stmt.returning(StockOwnership.quantity))).scalar_one()
+    else:
+        await db.execute(stmt)
+        holding = await _holding_quantity(db, user_id, j_id)
+
+    return OrderResponse(
+        j_id=j_id, side="buy", quantity=quantity, price=float(price),
+        amount=float(amount), money=float(money), holding_quantity=holding,
+    )
+
+async def sell_stock(db: AsyncSession, user_id: int, j_id: int, quantity: int) -> OrderResponse:
+    """주식 매도 - 지갑 입금 후 보유 수량 감소 (보유 수량 부족 시 호출자가 롤백)"""
+    price = await _get_price(db, j_id)
+    amount = price * quantity
+    # 매수와 같은 잠금 순서(지갑 -> 보유 주식)를 지키기 위해 입금을 먼저 수행
+    money = await credit_wallet(db, user_id, amount, "sell")
+
+    stmt = (
+        update(StockOwnership)
+        .where(
+            StockOwnership.user_id == user_id,
+            StockOwnership.j_id == j_id,
+            StockOwnership.quantity >= quantity,
+        )
+        .values(quantity=StockOwnership.quantity - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if supports_returning(db):
+        holding = (await db.execute(stmt.returning(StockOwnership.quantity))).scalar_one_or_none()
+    else:
+        result = await db.execute(stmt)
+        holding = await _holding_quantity(db, user_id, j_id) if result.rowcount else None
+    if holding is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="보유 주식 수량이 부족합니다."
+        )
+    if holding == 0:
+        await db.execute(
+            delete(StockOwnership).where(
+                StockOwnership.user_id == user_id,
+                StockOwnership.j_id == j_id,
+                StockOwnership.quantity == 0,
+            )
+        )
+
+    return OrderResponse(
+        j_id=j_id, side="sell", quantity=quantity, price=float(price),
+        amount=float(amount), money=float(money), holding_quantity=holding,
+    )
@@ -0,0 +1,201 @@
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import DECIMAL_15_2_LIMIT, User, UserWallet, WalletAdjustment, WalletAdjustmentResult, WalletLedger, WalletHistoryResponse, WalletLedgerEntry
+
+# 일괄 조정 시 한 트랜잭션에서 처리할 최대 항목 수
+WALLET_BATCH_SIZE = settings.wallet_batch_size
+
+def dialect_name(db: AsyncSession) -> str:
+    """세션이 연결된 DB 방언 이름"""
+    return db.bind.dialect.name
+
+def supports_returning(db: AsyncSession) -> bool:
+    """INSERT/UPDATE ... RETURNING 지원 여부 (MySQL 미지원)"""
+    return dialect_name(db) != "mysql"
+
+def upsert_statement(db: AsyncSession, model, values: Optional[Dict], key_columns: Iterable[str], update: Callable):
+    """방언별 단일 문장 upsert 생성
+
+    update는 삽입하려던 값의 컬럼 집합(MySQL inserted / SQLite excluded)을 받아 SET 절 딕셔너리를 반환
+    (MySQL에서는 딕셔너리 순서대로 SET 절을 생성)
+    values가 None이면 executemany용으로 파라미터 목록과 함께 실행
+    """
+    name = dialect_name(db)
+    if name == "mysql":
+        stmt = mysql_insert(model)
+    elif name == "sqlite":
+        stmt = sqlite_insert(model)
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(model)
+    else:
+        raise NotImplementedError(f"upsert를 지원하지 않는 DB입니다: {name}")
+    if values is not None:
+        stmt = stmt.values(**values)
+    if name == "mysql":
+        # MySQL은 SET 절을 왼쪽부터 평가하며 앞서 갱신된 값을 참조하므로 순서를 보존
+        return stmt.on_duplicate_key_update(list(dict(update(stmt.inserted)).items()))
+    return stmt.on_conflict_do_update(index_elements=list(key_columns), set_=dict(update(stmt.excluded)))
+
+async def append_ledger(db: AsyncSession, entries: List[Dict]):
+    """원장 기록 추가 (user_id, amount, balance_after, kind) - 여러 건은 executemany로 한 번에 삽입"""
+    if entries:
+        await db.execute(insert(WalletLedger), entries)
+
+async def credit_wallet(db: AsyncSession, user_id: int, amount: Decimal, kind: str = "credit") -> Decimal:
+    """지갑 잔액을 SQL에서 원자적으로 증가시키고 새 잔액 반환 (지갑이 없으면 생성)
+
+    커밋은 호출자가 수행하며, MySQL에서는 upsert가 잡은 행 잠금이 커밋까지 유지되므로
+    같은 트랜잭션의 후속 조회가 방금 반영한 잔액을 읽음
+    """
+    stmt = upsert_statement(
+        db,
+        UserWallet,
+        {"user_id": user_id, "money": amount},
+        ["user_id"],
+        lambda new: {"money": UserWallet.money + new.money},
+    )
+    if supports_returning(db):
+        result = await db.execute(stmt.returning(UserWallet.money))
+        money = result.scalar_one()
+    else:
+        await db.execute(stmt)
+        result = await db.execute(select(UserWallet.money).where(UserWallet.user_id == user_id))
+        money = result.scalar_one()
+    await append_ledger(db, [{"user_id": user_id, "amount": amount, "balance_after": money, "kind": kind}])
+    return money
+
+async def set_wallet_balance(db: AsyncSession, user_id: int, money: Decimal) -> Decimal:
+    """지갑 잔액을 단일 upsert 문으로 설정 (지갑이 없으면 생성)
+
+    이전 잔액을 읽지 않으므로(없는 행의 잠금 읽기는 MySQL에서 갭 잠금을 잡음) 원장에는 설정 후 잔액만 기록
+    """
+    stmt = upsert_statement(
+        db,
+        UserWallet,
+        {"user_id": user_id, "money": money},
+        ["user_id"],
+        lambda new: {"money": new.money},
+    )
+    await db.execute(stmt)
+    await append_ledger(db, [{"user_id": user_id, "amount": None, "balance_after": money, "kind": "set"}])
+    return money
+
+async def get_wallet_balance(db: AsyncSession, user_id: int) -> Decimal:
+    """지갑 잔액 조회 - 지갑이 없으면 0 (쓰기 없음)"""
+    result = await db.execute(select(UserWallet.money).where(UserWallet.user_id == user_id))
+    money = result.scalar_one_or_none()
+    return money if money is not None else Decimal("0")
+
+async def apply_wallet_adjustments(
+    db: AsyncSession,
+    items: List[Tuple[int, WalletAdjustment]],
+) -> List[WalletAdjustmentResult]:
+    """지갑 조정 묶음을 하나의 트랜잭션으로 적용하고 항목별 결과 반환
+
+    잔액 부족 판단은 user_id 순으로 잠근(FOR UPDATE) 현재 잔액 기준으로 항목 순서대로 수행하고,
+    반영은 사용자별 순변동액을 기존 지갑은 CASE 일괄 UPDATE, 신규 지갑은 executemany upsert로 처리
+    잠금은 이미 있는 지갑 행에만 걸어 MySQL에서 없는 행의 갭 잠금으로 인한 교착을 피함
+    커밋/롤백은 호출자가 수행
+    """
+    user_ids = sorted({adjustment.user_id for _, adjustment in items})
+    result = await db.execute(
+        select(User.user_id, UserWallet.user_id)
+        .outerjoin(UserWallet, UserWallet.user_id == User.user_id)
+        .where(User.user_id.in_(user_ids))
+    )
+    rows = result.all()
+    known_users = {user_id for user_id, _ in rows}
+    wallet_ids = sorted(wallet_id for _, wallet_id in rows if wallet_id is not None)
+    existing: Dict[int, Decimal] = {}
+    if wallet_ids:
+        result = await db.execute(
+            select(UserWallet.user_id, UserWallet.money)
+            .where(UserWallet.user_id.in_(wallet_ids))
+            .order_by(UserWallet.user_id)
+            .with_for_update()
+        )
+        existing = {user_id: Decimal(money or 0) for user_id, money in result.all()}
+
+    balances = dict(existing)
+    deltas: Dict[int, Decimal] = {}
+    results = []
+    for index, adjustment in items:
+        amount = Decimal(str(adjustment.amount))
+        if adjustment.user_id not in known_users:
+            results.append(WalletAdjustmentResult(index=index, user_id=adjustment.user_id, status="unknown_user"))
+            continue
+        if not amount.is_finite() or amount == 0:
+            results.append(WalletAdjustmentResult(
+                index=index, user_id=adjustment.user_id, status="invalid", detail="금액은 0이 아닌 유한한 값이어야 합니다."
+            ))
+            continue
+        balance = balances.get(adjustment.user_id, Decimal("0")) + amount
+        # 컬럼 범위를 넘는 잔액은 묶음 전체의 UPDATE를 실패시키므로 항목 단위로 거절
+        if balance >= DECIMAL_15_2_LIMIT:
+            results.append(WalletAdjustmentResult(
+                index=index, user_id=adjustment.user_id, status="invalid", detail="잔액 한도를 초과합니다.",
+                money=float(balances.get(adjustment.user_id, Decimal("0"))),
+            ))
+            continue
+        if balance < 0:
+            results.append(WalletAdjustmentResult(
+                index=index, user_id=adjustment.user_id, status="insufficient_funds",
+                money=float(balances.get(adjustment.user_id, Decimal("0"))),
+            ))
+            continue
+        balances[adjustment.user_id] = balance
+        deltas[adjustment.user_id] = deltas.get(adjustment.user_id, Decimal("0")) + amount
+        results.append(WalletAdjustmentResult(
+            index=index, user_id=adjustment.user_id, status="applied", money=float(balance)
+        ))
+
+    updates = {user_id: delta for user_id, delta in deltas.items() if user_id in existing and delta != 0}
+    if updates:
+        await db.execute(
+            update(UserWallet)
+            .where(UserWallet.user_id.in_(list(updates)))
+            .values(money=UserWallet.money + case(updates, value=UserWallet.user_id, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+    inserts = [
+        {"user_id": user_id, "money": delta}
+        for user_id, delta in deltas.items() if user_id not in existing
+    ]
+    if inserts:
+        # 잠그지 않은 신규 지갑은 동시 생성에 대비해 upsert로 증가 (신규 지갑의 차감은 잔액 부족으로 거절되므로 음수가 되지 않음)
+        stmt = upsert_statement(db, UserWallet, None, ["user_id"], lambda new: {"money": UserWallet.money + new.money})
+        await db.execute(stmt, inserts)
+    await append_ledger(db, [
+        {
+            "user_id": result.user_id,
+            "amount": Decimal(str(adjustment.amount)),
+            "balance_after": Decimal(str(result.money)),
+            "kind": "adjustment",
+        }
+        for result, (_, adjustment) in zip(results, items) if result.status == "applied"
+    ])
+    return results
+
+async def get_wallet_history(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    cursor: Optional[int] = None,
+) -> WalletHistoryResponse:
+    """지갑 거래 내역 (최신순) - OFFSET 대신 (user_id, id) 인덱스를 타는 키셋 페이지네이션"""
+    stmt = select(WalletLedger).where(WalletLedger.user_id == user_id)
+    if cursor is not None:
+        stmt = stmt.where(WalletLedger.id < cursor)
+    result = await db.execute(stmt.order_by(WalletLedger.id.desc()).limit(limit + 1))
+    rows = result.scalars().all()
+    entries = [WalletLedgerEntry.model_validate(row) for row in rows[:limit]]
+    next_cursor = entries[-1].id if len(rows) > limit else None
+    return WalletHistoryResponse(entries=entries, next_cursor=next_cursor)